@@ -0,0 +1 @@
+"""Mock API server and benchmarks for the Contact Energy integration."""
@@ -0,0 +1,292 @@
+"""Local stand-in for the Contact Energy API.
+
+Implements the three endpoints the integration uses, /login/v2, /accounts/v2
+and /usage/v2/{contract}, with configurable latency, error injection and data
+volume. Usage is generated deterministically per contract and day, with real
+Pacific/Auckland offsets (23 and 25 hour days included).
+
+Run it standalone and point a development instance at it:
+
+    python -m benchmarks.mock_server --port 8765 --latency 0.3 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from aiohttp import web
+
+TIME_ZONE = ZoneInfo("Pacific/Auckland")
+ACCOUNT_ID = "500000000"
+API_KEY = "z840P4lQCH9TqcjC9L2pP157DZcZJMcr5tVQCvyx"
+
+
+@dataclass
+class MockSettings:
+    """Behaviour of the mock server."""
+
+    # Seconds added to every response, plus up to `jitter` seconds at random.
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Fraction of requests answered with `error_status` instead of data.
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Number of electricity contracts on the account.
+    contracts: int = 1
+    # Days of history available, ending `lag_days` before today.
+    history_days: int = 400
+    lag_days: int = 2
+    # Number of requests a session token is valid for; 0 never expires.
+    token_ttl: int = 0
+    # Hours (local time) in which energy is free.
+    free_hours: tuple[int, ...] = (21, 22, 23)
+    seed: int = 0
+
+
+@dataclass
+class MockStats:
+    """Counters kept by the mock server."""
+
+    requests: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    bytes_sent: int = 0
+
+    def record(self, endpoint: str) -> None:
+        """Count one request."""
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    @property
+    def total(self) -> int:
+        """Return the total number of requests."""
+        return sum(self.requests.values())
+
+
+def contract_id(index: int) -> str:
+    """Return the id of the nth mock contract."""
+    return f"{1000000 + index}"
+
+
+def contract_icp(index: int) -> str:
+    """Return the ICP of the nth mock contract."""
+    return f"0000{index:06d}UN000"
+
+
+class MockContactEnergyApi:
+    """aiohttp application emulating the Contact Energy API."""
+
+    def __init__(self, settings: MockSettings | None = None) -> None:
+        """Initialize the mock API."""
+        self.settings = settings or MockSettings()
+        self.stats = MockStats()
+        self._random = random.Random(self.settings.seed)
+        self._tokens: dict[str, int] = {}
+        self.app = web.Application()
+        self.app.router.add_post("/login/v2", self._login)
+        self.app.router.add_get("/accounts/v2", self._accounts)
+        self.app.router.add_post("/usage/v2/{contract}", self._usage)
+
+    @property
+    def latest_day(self) -> date:
+        """Return the newest day with usage data."""
+        return datetime.now(TIME_ZONE).date() - timedelta(days=self.settings.lag_days)
+
+    @property
+    def earliest_day(self) -> date:
+        """Return the oldest day with usage data."""
+        return self.latest_day - timedelta(days=self.settings.history_days - 1)
+
+    async def _begin(self, request: web.Request, endpoint: str, auth: bool = True) -> None:
+        """Count the request, apply latency and raise injected failures."""
+        self.stats.record(endpoint)
+        settings = self.settings
+        delay = settings.latency + self._random.uniform(0, settings.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if request.headers.get("x-api-key") != API_KEY:
+            raise web.HTTPForbidden()
+
+        if settings.error_rate and self._random.random() < settings.error_rate:
+            self.stats.errors += 1
+            if settings.error_status == 503:
+                raise web.HTTPServiceUnavailable(reason="Injected failure")
+            raise web.HTTPInternalServerError(reason="Injected failure")
+
+        if auth:
+            token = request.headers.get("session")
+            if token not in self._tokens:
+                raise web.HTTPUnauthorized()
+            if settings.token_ttl:
+                self._tokens[token] += 1
+                if self._tokens[token] > settings.token_ttl:
+                    del self._tokens[token]
+                    raise web.HTTPUnauthorized()
+
+    def _json(self, data) -> web.Response:
+        """Return a JSON response and count its size."""
+        response = web.json_response(data)
+        self.stats.bytes_sent += len(response.body)
+        return response
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Issue a session token for any credentials."""
+        await self._begin(request, "login", auth=False)
+        body = await request.json()
+        if not body.get("username") or not body.get("password"):
+            raise web.HTTPUnauthorized()
+        token = f"token-{self._random.getrandbits(64):016x}"
+        self._tokens[token] = 0
+        return self._json({"token": token})
+
+    async def _accounts(self, request: web.Request) -> web.Response:
+        """Return one account with the configured number of contracts."""
+        await self._begin(request, "accounts")
+        today = datetime.now(TIME_ZONE).date()
+        as_text = lambda day: day.strftime("%d %b %Y")  # noqa: E731
+
+        contracts = [
+            {
+                "id": contract_id(index),
+                "contractType": 1,
+                "icp": contract_icp(index),
+                "premise": {"supplyAddress": {"shortForm": f"{index + 1} Mock Street, Wellington"}},
+                "devices": [
+                    {
+                        "nextMeterReadDate": as_text(today + timedelta(days=20)),
+                        "registers": [{"previousMeterReadingDate": as_text(today - timedelta(days=10))}],
+                    }
+                ],
+            }
+            for index in range(self.settings.contracts)
+        ]
+        payments = [
+            {"amount": "$150.00", "date": as_text(today - timedelta(days=30 * month))}
+            for month in range(1, 13)
+        ]
+        return self._json(
+            {
+                "accountDetail": {
+                    "id": ACCOUNT_ID,
+                    "accountBalance": {"currentBalance": 42.5},
+                    "nextBill": {"amount": 180.25, "date": as_text(today + timedelta(days=14))},
+                    "invoice": {"amountDue": 150.0, "paymentDueDate": as_text(today + timedelta(days=7))},
+                    "contracts": contracts,
+                    "payments": payments,
+                }
+            }
+        )
+
+    async def _usage(self, request: web.Request) -> web.Response:
+        """Return hourly or daily usage points for the requested inclusive date range."""
+        await self._begin(request, "usage")
+        contract = request.match_info["contract"]
+        interval = request.query.get("interval")
+        if request.query.get("ba") != ACCOUNT_ID or interval not in ("hourly", "daily"):
+            raise web.HTTPBadRequest()
+        try:
+            first = date.fromisoformat(request.query["from"])
+            last = date.fromisoformat(request.query["to"])
+        except (KeyError, ValueError) as error:
+            raise web.HTTPBadRequest() from error
+
+        points = []
+        day = max(first, self.earliest_day)
+        while day <= min(last, self.latest_day):
+            if interval == "daily":
+                points.append(self.day_total(contract, day))
+            else:
+                points.extend(self.day_points(contract, day))
+            day += timedelta(days=1)
+        return self._json(points)
+
+    def day_points(self, contract: str, day: date) -> list[dict]:
+        """Generate the hourly points of one local day."""
+        day_random = random.Random(f"{self.settings.seed}:{contract}:{day.isoformat()}")
+        start = datetime(day.year, day.month, day.day, tzinfo=TIME_ZONE).astimezone(timezone.utc)
+        end = (datetime(day.year, day.month, day.day, tzinfo=TIME_ZONE) + timedelta(days=1)).astimezone(
+            timezone.utc
+        )
+
+        points = []
+        hour = start
+        while hour < end:
+            local = hour.astimezone(TIME_ZONE)
+            kwh = round(day_random.uniform(0.1, 2.5), 2)
+            free = local.hour in self.settings.free_hours
+            points.append(
+                {
+                    "date": local.isoformat(timespec="milliseconds"),
+                    "value": f"{kwh:.2f}",
+                    "unit": "kWh",
+                    "dollarValue": "0.00" if free else f"{kwh * 0.28:.2f}",
+                    "offpeakValue": f"{kwh:.2f}" if free else "0.00",
+                    "offpeakDollarValue": "0.00",
+                    "currency": "NZD",
+                    "timeZone": "Pacific/Auckland",
+                }
+            )
+            hour += timedelta(hours=1)
+        return points
+
+    def day_total(self, contract: str, day: date) -> dict:
+        """Aggregate the hourly points of one local day into a daily point."""
+        points = self.day_points(contract, day)
+        total = lambda key: sum(float(point[key]) for point in points)  # noqa: E731
+        return {
+            **points[0],
+            "value": f"{total('value'):.2f}",
+            "dollarValue": f"{total('dollarValue'):.2f}",
+            "offpeakValue": f"{total('offpeakValue'):.2f}",
+        }
+
+
+async def async_start_server(
+    settings: MockSettings | None = None, host: str = "127.0.0.1", port: int = 0
+) -> tuple[MockContactEnergyApi, web.AppRunner, str]:
+    """Start the mock API and return it with its runner and base URL."""
+    mock = MockContactEnergyApi(settings)
+    runner = web.AppRunner(mock.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    return mock, runner, f"http://{host}:{bound_port}"
+
+
+def serve(settings: MockSettings, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """Run the mock API until interrupted."""
+    web.run_app(MockContactEnergyApi(settings).app, host=host, port=port, access_log=None, print=None)
+
+
+def main() -> None:
+    """Run the mock API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, choices=(500, 503), default=503)
+    parser.add_argument("--contracts", type=int, default=1)
+    parser.add_argument("--history-days", type=int, default=400)
+    parser.add_argument("--lag-days", type=int, default=2)
+    parser.add_argument("--token-ttl", type=int, default=0, help="requests per token, 0 for no expiry")
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        contracts=args.contracts,
+        history_days=args.history_days,
+        lag_days=args.lag_days,
+        token_ttl=args.token_ttl,
+    )
+    serve(settings, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Replay a recorded capture through the API client and statistics pipeline.
+
+Captures are written by the integration when "Record API responses" is
+enabled, to <config>/contact_energy_captures/*.jsonl.gz. Every recorded usage
+request is replayed through ContactEnergyApi.get_usage_range, the points are
+converted to HourlyUsage and passed to build_statistics, all under cProfile.
+
+    python -m benchmarks.replay_capture capture.jsonl.gz --top 25
+"""
+import argparse
+import asyncio
+import cProfile
+import pstats
+import sys
+import time
+from datetime import date
+
+from homeassistant.core import HomeAssistant
+from yarl import URL
+
+from custom_components.contact_energy.api import ContactEnergyApi
+from custom_components.contact_energy.capture import ReplaySession
+from custom_components.contact_energy.const import USAGE_INTERVAL_HOURLY
+from custom_components.contact_energy.statistics import build_statistics, statistic_ids
+from custom_components.contact_energy.usage import HourlyUsage
+
+
+def _output(line: str = "") -> None:
+    print(line)  # noqa: T201
+
+
+async def async_replay(session: ReplaySession) -> tuple[int, int, int]:
+    """Replay every recorded usage request; return requests, days and rows."""
+    api = ContactEnergyApi(
+        HomeAssistant(), "replay@example.com", "password", session=session, url_base="http://replay"
+    )
+    requests = days = rows = 0
+    for entry in session.entries:
+        if entry["endpoint"] != "usage" or entry["status"] != 200:
+            continue
+        url = URL(entry["path"])
+        interval = url.query.get("interval", USAGE_INTERVAL_HOURLY)
+        usage = await api.get_usage_range(
+            date.fromisoformat(url.query["from"]),
+            date.fromisoformat(url.query["to"]),
+            url.query["ba"],
+            url.name,
+            interval,
+        )
+        requests += 1
+        if not usage:
+            continue
+        aggregated = interval != USAGE_INTERVAL_HOURLY
+        hourly = HourlyUsage.concat(
+            HourlyUsage.from_points(points, aggregated) for _, points in sorted(usage.items())
+        )
+        result = build_statistics(hourly, statistic_ids(url.name, interval=interval))
+        days += len(usage)
+        rows += sum(len(statistics) for statistics in result.statistics.values())
+    return requests, days, rows
+
+
+def main() -> int:
+    """Replay a capture file and print a profile."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="capture file (.jsonl.gz)")
+    parser.add_argument("--realtime", action="store_true", help="reproduce the recorded latency")
+    parser.add_argument("--top", type=int, default=20, help="number of profile entries to show")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key")
+    args = parser.parse_args()
+
+    session = ReplaySession.from_file(args.capture, realtime=args.realtime)
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    requests, days, rows = asyncio.run(async_replay(session))
+    profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    _output(f"{len(session.entries)} responses, {requests} usage requests, {days} days, {rows} rows")
+    _output(f"{elapsed:.3f}s")
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats(args.sort).print_stats(args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""End-to-end usage update benchmarks against the local mock API.
+
+Each scenario runs ContactEnergyUsageSensor.async_update for a window of N
+days on one or more contracts sharing a single API client, starting from a
+logged out client. The mock server runs in a separate process so its work
+does not count against the client. Recorder writes are replaced by a counter
+of imported rows.
+
+Measured per scenario:
+  wall_s      median update wall time over --repeat runs
+  requests    HTTP requests made by the client, retries included
+  blocked_ms  median total event-loop stall time, counting stalls over 5 ms
+  max_ms      longest single stall
+  peak_kib    peak memory allocated during one update (tracemalloc)
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --json results.json
+    python -m benchmarks.run_benchmarks --compare results.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from unittest.mock import patch
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from benchmarks.mock_server import (
+    ACCOUNT_ID,
+    MockSettings,
+    contract_icp,
+    contract_id,
+    serve,
+)
+from custom_components.contact_energy.api import ContactEnergyApi
+from custom_components.contact_energy.sensors.usage_sensor import (
+    ContactEnergyUsageSensor,
+)
+
+LOOP_MONITOR_INTERVAL = 0.005
+# Metrics compared by --compare; a scenario regresses when one grows by more
+# than the tolerance.
+COMPARED_METRICS = ("wall_s", "requests", "blocked_ms", "peak_kib")
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one scenario."""
+
+    name: str
+    days: int
+    contracts: int
+    wall_s: float
+    requests: int
+    rows: int
+    blocked_ms: float
+    max_block_ms: float
+    peak_kib: float
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked.
+
+    A task sleeps for a short interval in a loop; any time it wakes up later
+    than asked is time the loop spent running something else without yielding.
+    """
+
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL) -> None:
+        """Initialize the monitor."""
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.blocked = 0.0
+        self.max_block = 0.0
+
+    def start(self) -> None:
+        """Start monitoring."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = loop.time() - started - self._interval
+            if lag > self._interval:
+                self.blocked += lag
+                self.max_block = max(self.max_block, lag)
+
+
+class RowCounter:
+    """Stand-in for the recorder's external statistics import."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.rows = 0
+
+    def __call__(self, hass, metadata, statistics) -> None:
+        """Count the imported rows."""
+        self.rows += len(statistics)
+
+
+async def _async_update(base_url: str, days: int, contracts: int) -> tuple[float, int, int, LoopMonitor]:
+    """Run one update of every contract's usage sensor on a fresh client."""
+    counter = RowCounter()
+    monitor = LoopMonitor()
+    hass = HomeAssistant()
+    async with aiohttp.ClientSession() as session:
+        api = ContactEnergyApi(
+            hass, "benchmark@example.com", "password", session=session, url_base=base_url
+        )
+        sensors = [
+            ContactEnergyUsageSensor(
+                hass,
+                f"Usage {index}",
+                api,
+                contract_icp(index),
+                "kWh",
+                "mdi:meter-electric",
+                usage_days=days,
+                incremental=False,
+                account_id=ACCOUNT_ID,
+                contract_id=contract_id(index),
+            )
+            for index in range(contracts)
+        ]
+
+        with patch(
+            "custom_components.contact_energy.sensors.usage_sensor.async_add_external_statistics", counter
+        ):
+            monitor.start()
+            started = time.perf_counter()
+            results = await asyncio.gather(*(sensor.async_update() for sensor in sensors))
+            wall = time.perf_counter() - started
+            await monitor.stop()
+
+    if not all(results):
+        raise RuntimeError(f"Usage update failed for {days} days on {contracts} contracts")
+    return wall, sum(api.metrics.requests.values()), counter.rows, monitor
+
+
+async def async_run_scenario(base_url: str, days: int, contracts: int, repeat: int) -> ScenarioResult:
+    """Run a scenario `repeat` times for timing, then once more for memory."""
+    runs = [await _async_update(base_url, days, contracts) for _ in range(repeat)]
+    _, requests, rows, _ = runs[-1]
+
+    tracemalloc.start()
+    try:
+        await _async_update(base_url, days, contracts)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return ScenarioResult(
+        name=f"{days}d x {contracts}",
+        days=days,
+        contracts=contracts,
+        wall_s=round(statistics.median(run[0] for run in runs), 4),
+        requests=requests,
+        rows=rows,
+        blocked_ms=round(statistics.median(run[3].blocked for run in runs) * 1000, 1),
+        max_block_ms=round(max(run[3].max_block for run in runs) * 1000, 1),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def _free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    """Wait until the mock server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def compare(results: list[ScenarioResult], baseline_path: str, tolerance: float) -> list[str]:
+    """Return a description of every metric that regressed against a baseline."""
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = {result["name"]: result for result in json.load(baseline_file)["results"]}
+
+    regressions = []
+    for result in results:
+        if (previous := baseline.get(result.name)) is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous[metric], getattr(result, metric)
+            # Ignore noise on metrics that are close to zero
+            if new > old * (1 + tolerance) and new - old > 1:
+                regressions.append(f"{result.name}: {metric} {old} -> {new}")
+    return regressions
+
+
+def _output(line: str = "") -> None:
+    print(line)  # noqa: T201
+
+
+def main() -> int:
+    """Run the benchmarks and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[10, 90, 365])
+    parser.add_argument("--contracts", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock API latency, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random extra latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="compare against results written by --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth")
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        contracts=max(args.contracts),
+        history_days=max(args.days) + 30,
+    )
+    port = _free_port()
+    server = multiprocessing.Process(target=serve, args=(settings, "127.0.0.1", port), daemon=True)
+    server.start()
+    try:
+        _wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}"
+        results = [
+            asyncio.run(async_run_scenario(base_url, days, contracts, args.repeat))
+            for days in args.days
+            for contracts in args.contracts
+        ]
+    finally:
+        server.terminate()
+        server.join()
+
+    _output(f"{'scenario':<14}{'wall_s':>9}{'requests':>10}{'rows':>8}{'blocked_ms':>12}{'max_ms':>8}{'peak_kib':>11}")
+    for result in results:
+        _output(
+            f"{result.name:<14}{result.wall_s:>9.3f}{result.requests:>10}{result.rows:>8}"
+            f"{result.blocked_ms:>12.1f}{result.max_block_ms:>8.1f}{result.peak_kib:>11.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as results_file:
+            json.dump(
+                {"settings": asdict(settings), "results": [asdict(result) for result in results]},
+                results_file,
+                indent=2,
+            )
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            _output(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
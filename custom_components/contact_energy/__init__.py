@@ -3,12 +3,28 @@ import logging
 import asyncio
 from typing import Any
 
+import async_timeout
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .api import ContactEnergyApi
-from .const import DOMAIN
+from .api import async_get_api, async_remove_api
+from .backfill import backfill_store
+from .capture import ResponseRecorder, capture_path
+from .const import (
+    CONF_CONTRACT_ICP,
+    CONF_CONTRACT_ID,
+    CONF_CONTRACTS,
+    CONF_LEGACY_STATISTICS,
+    CONF_RECORD_RESPONSES,
+    DOMAIN,
+    STARTUP_TIME_BUDGET,
+    USAGE_INTERVALS,
+)
+from .ratelimit import async_update_rate_limit
+from .scheduler import schedule_store
+from .services import async_setup_services, async_unload_services
+from .usage_cache import ContactEnergyUsageCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,18 +36,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     hass.data.setdefault(DOMAIN, {})
     
-    # Create API instance
-    api = ContactEnergyApi(hass, entry.data["email"], entry.data["password"])
-    
     try:
-        if not await api.async_login():
-            _LOGGER.error("Failed to log in during setup")
-            return False
-            
-        _LOGGER.debug("Successfully logged in during setup")
-        
+        # Shared, token-persisting client for this login; only log in when no
+        # token survived the restart, otherwise wait for a 401 to refresh it.
+        # A login slower than the startup budget is left to the first refresh.
+        # Recording starts first so the setup login is captured too.
+        api = await async_get_api(hass, entry.data["email"], entry.data["password"])
+        if entry.data.get(CONF_RECORD_RESPONSES) and api.recorder is None:
+            api.recorder = ResponseRecorder(hass, capture_path(hass))
+            _LOGGER.warning("Recording Contact Energy API responses to %s", api.recorder.path)
+
+        if not api._api_token:
+            try:
+                async with async_timeout.timeout(STARTUP_TIME_BUDGET.total_seconds()):
+                    logged_in = await api.async_login()
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Login is taking too long, continuing setup without it")
+                logged_in = True
+            if not logged_in:
+                _LOGGER.error("Failed to log in during setup")
+                if not any(
+                    hass.data[DOMAIN].get(other.entry_id) is api
+                    for other in hass.config_entries.async_entries(DOMAIN)
+                ):
+                    async_remove_api(hass, entry.data["email"])
+                return False
+
         # Store API instance for platforms to use
         hass.data[DOMAIN][entry.entry_id] = api
+        async_update_rate_limit(hass)
+        async_setup_services(hass)
         
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
         
@@ -47,6 +81,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Unload sensors
         if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
             hass.data[DOMAIN].pop(entry.entry_id)
+            if not any(
+                other.entry_id in hass.data[DOMAIN] for other in hass.config_entries.async_entries(DOMAIN)
+            ):
+                async_unload_services(hass)
             
         return unload_ok
     
@@ -54,6 +92,45 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.exception("Error unloading Contact Energy integration: %s", error)
         return False
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when a config entry is deleted."""
+    # An entry removed before its migration to version 2 still has one contract
+    contracts = entry.data.get(CONF_CONTRACTS, [])
+    if not contracts and CONF_CONTRACT_ICP in entry.data:
+        contracts = [{CONF_CONTRACT_ICP: entry.data[CONF_CONTRACT_ICP]}]
+    for contract in contracts:
+        icp = contract[CONF_CONTRACT_ICP]
+        await ContactEnergyUsageCache(hass, icp).async_remove()
+        for interval in USAGE_INTERVALS:
+            await backfill_store(hass, icp, interval).async_remove()
+        await schedule_store(hass, icp).async_remove()
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate a single-contract entry to the list of contracts used since version 2."""
+    if entry.version == 1:
+        data = {**entry.data}
+        contract = {
+            CONF_CONTRACT_ID: data.pop(CONF_CONTRACT_ID),
+            CONF_CONTRACT_ICP: data.pop(CONF_CONTRACT_ICP),
+        }
+        # Every version 1 entry imported to the same statistic ids. The first
+        # one migrated keeps them so the existing history stays attached to
+        # its ICP; the others start their own per-ICP statistics.
+        legacy_claimed = any(
+            other.get(CONF_LEGACY_STATISTICS)
+            for other_entry in hass.config_entries.async_entries(DOMAIN)
+            for other in other_entry.data.get(CONF_CONTRACTS, [])
+        )
+        if not legacy_claimed:
+            contract[CONF_LEGACY_STATISTICS] = True
+        data[CONF_CONTRACTS] = [contract]
+
+        entry.version = 2
+        hass.config_entries.async_update_entry(entry, data=data)
+        _LOGGER.info("Migrated Contact Energy entry for ICP %s to version 2", contract[CONF_CONTRACT_ICP])
+
+    return True
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -1,36 +1,96 @@
 """Contact Energy API client."""
 import asyncio
 import logging
-from typing import Any, Optional
-from datetime import datetime, timedelta
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+from datetime import date, datetime, timedelta
 import aiohttp
 import async_timeout
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ACCOUNT_CACHE_MAX_STALENESS,
+    ACCOUNT_CACHE_SAVE_DELAY,
+    ACCOUNT_CACHE_STORAGE_VERSION,
+    ACCOUNT_CACHE_TTL,
+    API_URL_BASE,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    DATA_ACCOUNT_STORE,
+    DATA_CLIENTS,
+    DATA_CLIENTS_LOCK,
+    DATA_TOKEN_STORE,
+    DOMAIN,
+    REQUEST_BACKOFF_BASE,
+    REQUEST_BACKOFF_MAX,
+    REQUEST_MAX_RETRIES,
+    REQUEST_RETRY_BUDGET,
+    REQUEST_TIMEOUTS,
+    TOKEN_SAVE_DELAY,
+    TOKEN_STORAGE_VERSION,
+    USAGE_INTERVAL_HOURLY,
+    USAGE_MAX_CONCURRENCY,
+    USAGE_RANGE_MAX_DAYS,
+)
+from .metrics import ApiMetrics
+from .ratelimit import PRIORITY_NORMAL, TokenBucketLimiter, async_get_rate_limiter
 
 _LOGGER = logging.getLogger(__name__)
 
 class ContactEnergyApi:
     """Async Contact Energy API client."""
 
-    def __init__(self, hass: HomeAssistant, email: str, password: str, account_id: str = None, contract_id: str = None):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        email: str,
+        password: str,
+        account_id: str = None,
+        contract_id: str = None,
+        max_concurrency: int = USAGE_MAX_CONCURRENCY,
+        token_store: "ContactEnergyTokenStore" = None,
+        timeouts: dict[str, float] | None = None,
+        session: aiohttp.ClientSession | None = None,
+        url_base: str = API_URL_BASE,
+        rate_limiter: TokenBucketLimiter | None = None,
+        account_store: "ContactEnergyAccountStore" = None,
+    ):
         """Initialize the API."""
-        self._api_token = ""
+        self._hass = hass
+        self._token_store = token_store
+        self._account_store = account_store
+        self._api_token = token_store.get(email) if token_store else ""
         self._contractId = contract_id
         self._accountId = account_id
-        self._url_base = "https://api.contact-digital-prod.net"
+        self._url_base = url_base
         self._api_key = "z840P4lQCH9TqcjC9L2pP157DZcZJMcr5tVQCvyx"
         self._email = email
         self._password = password
-        self._session = async_get_clientsession(hass)
-        self._account_cache = None
-        self._account_cache_timestamp = None
-        self._account_cache_duration = timedelta(minutes=15)
-        self._account_request = None
+        self._session = session or async_get_clientsession(hass)
+        # Last good /accounts/v2 payload, restored from the store on a cold start
+        self._account_cache, self._account_cache_timestamp = (
+            account_store.get(email) if account_store else (None, None)
+        )
+        self._account_request: asyncio.Task | None = None
+        self._account_listeners: list[Callable[[dict], None]] = []
         self._login_lock = asyncio.Lock()
-        self._account_lock = asyncio.Lock()
+        self._usage_semaphore = asyncio.Semaphore(max_concurrency)
+        # In-flight usage requests, keyed by account, contract, interval, range
+        # and priority
+        self._usage_requests: dict[tuple[str, ...], asyncio.Task] = {}
+        self._timeouts = {**REQUEST_TIMEOUTS, **(timeouts or {})}
+        self._breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        self._rate_limiter = rate_limiter
+        self.metrics = ApiMetrics()
+        # Optional ResponseRecorder capturing raw responses for offline replay
+        self.recorder = None
 
     def _get_headers(self, include_token: bool = True) -> dict:
         """Get headers for API requests."""
@@ -39,27 +99,96 @@ class ContactEnergyApi:
             headers["session"] = self._api_token
         return headers
 
-    async def _async_request(self, method: str, url: str, **kwargs) -> Any:
-        """Make an async request with timeout and error handling."""
+    async def _async_request(
+        self, method: str, url: str, endpoint: str = "default", priority: int = PRIORITY_NORMAL, **kwargs
+    ) -> Any:
+        """Make an async request with timeout, retry and circuit breaker handling.
+
+        Timeouts, connection errors and 5xx responses are retried up to
+        REQUEST_MAX_RETRIES times with jittered exponential backoff, within
+        REQUEST_RETRY_BUDGET seconds in all. While the circuit breaker is open,
+        requests fail fast with CannotConnect, including retries of requests
+        that were already under way. Every attempt waits for the shared rate
+        limiter at the given priority.
+        """
+        if not self._breaker.allow_request():
+            raise CannotConnect(f"Contact Energy API unavailable, not calling {url}")
+
+        try:
+            return await self._async_request_with_retry(method, url, endpoint, priority, **kwargs)
+        except (CannotConnect, InvalidAuth, UnknownError) as error:
+            self.metrics.record_error(endpoint, error)
+            raise
+
+    async def _async_request_with_retry(
+        self, method: str, url: str, endpoint: str, priority: int, **kwargs
+    ) -> Any:
+        """Make a request, retrying timeouts, connection errors and 5xx responses."""
+        timeout = self._timeouts.get(endpoint, self._timeouts["default"])
+        deadline = time.monotonic() + REQUEST_RETRY_BUDGET
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.async_acquire(priority)
+            # No attempt runs past the budget, but each gets at least a second
+            attempt_timeout = min(timeout, max(deadline - time.monotonic(), 1.0))
+            try:
+                return await self._async_request_once(method, url, endpoint, attempt_timeout, **kwargs)
+            except (CannotConnect, _ServerError) as error:
+                delay = min(REQUEST_BACKOFF_MAX, REQUEST_BACKOFF_BASE * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.5)
+                if (
+                    attempt >= REQUEST_MAX_RETRIES
+                    or self._breaker.is_open
+                    or time.monotonic() + delay >= deadline
+                ):
+                    self._breaker.record_failure()
+                    if isinstance(error, _ServerError):
+                        raise CannotConnect(str(error)) from error
+                    raise
+                attempt += 1
+                _LOGGER.debug(
+                    "Request to %s failed (%s), retry %d/%d in %.1fs",
+                    url, error, attempt, REQUEST_MAX_RETRIES, delay
+                )
+                await asyncio.sleep(delay)
+                if self._breaker.is_open:
+                    raise CannotConnect(f"Contact Energy API unavailable, not retrying {url}") from error
+
+    async def _async_request_once(self, method: str, url: str, endpoint: str, timeout: float, **kwargs) -> Any:
+        """Make a single request attempt."""
+        started = time.monotonic()
         try:
-            async with async_timeout.timeout(30):
+            async with async_timeout.timeout(timeout):
                 async with self._session.request(method, url, **kwargs) as response:
                     _LOGGER.debug("%s response status: %s", url, response.status)
-                    # response_text = await response.text()
-                    # _LOGGER.debug("%s response body: %s", url, response_text)
-                    
+
+                    body = await response.read()
+                    elapsed = time.monotonic() - started
+                    self.metrics.record_request(endpoint, elapsed, len(body))
+                    if self.recorder is not None:
+                        self.recorder.async_record(method, url, endpoint, response.status, body, elapsed)
+
+                    if response.status >= 500:
+                        raise _ServerError(f"{url} returned {response.status}")
+
+                    self._breaker.record_success()
                     if response.status == 200:
                         return await response.json()
                     elif response.status == 401:
                         self._api_token = ""  # Clear invalid token
                         raise InvalidAuth
+                    elif response.status >= 400:
+                        raise RequestRejected(f"{url} returned {response.status}")
                     return None
-                    
+
+        except (InvalidAuth, RequestRejected, _ServerError):
+            raise
         except asyncio.TimeoutError as error:
-            _LOGGER.error("Timeout during request to %s: %s", url, error)
+            _LOGGER.warning("Timeout during request to %s: %s", url, error)
             raise CannotConnect from error
         except aiohttp.ClientError as error:
-            _LOGGER.error("Error connecting to %s: %s", url, error)
+            _LOGGER.warning("Error connecting to %s: %s", url, error)
             raise CannotConnect from error
         except Exception as error:
             _LOGGER.exception("Unexpected error during request to %s: %s", url, error)
@@ -80,12 +209,15 @@ class ContactEnergyApi:
                 result = await self._async_request(
                     "POST",
                     f"{self._url_base}/login/v2",
+                    endpoint="login",
                     json=data,
                     headers=self._get_headers(include_token=False)
                 )
                 
                 if result and "token" in result:
                     self._api_token = result["token"]
+                    if self._token_store:
+                        self._token_store.async_set(self._email, self._api_token)
                     _LOGGER.debug("Login successful")
                     return True
                 
@@ -96,82 +228,287 @@ class ContactEnergyApi:
                 _LOGGER.exception("Login failed: %s", error)
                 return False
 
+    @property
+    def circuit_breaker_open(self) -> bool:
+        """Return True while the circuit breaker is rejecting requests."""
+        return self._breaker.is_open
+
+    @property
+    def account_cache_age(self) -> timedelta | None:
+        """Return how old the cached account payload is, if there is one."""
+        if self._account_cache is None or self._account_cache_timestamp is None:
+            return None
+        return dt_util.utcnow() - self._account_cache_timestamp
+
+    @callback
+    def async_add_account_listener(self, update_callback: Callable[[dict], None]) -> CALLBACK_TYPE:
+        """Listen for account payloads fetched by a background refresh."""
+        self._account_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._account_listeners.remove(update_callback)
+
+        return remove_listener
+
     async def async_get_accounts(self) -> dict:
-        """Get accounts information with caching and request deduplication."""
-        now = datetime.now()
+        """Get accounts information, serving the cache while it is revalidated.
 
-        # Check if cache is valid
-        if (self._account_cache and self._account_cache_timestamp and 
-            (now - self._account_cache_timestamp) < self._account_cache_duration):
+        A payload younger than ACCOUNT_CACHE_TTL is returned as is. An older one
+        is still returned straight away, up to ACCOUNT_CACHE_MAX_STALENESS, while
+        a single background refresh fetches a new one and hands it to the
+        account listeners. Only without a usable payload do callers wait, and
+        then they share the same request.
+        """
+        age = self.account_cache_age
+        if age is not None and age < ACCOUNT_CACHE_TTL:
+            self.metrics.record_cache("accounts", hits=1)
             return self._account_cache
 
-        async with self._account_lock:
-            # After acquiring lock, check cache again
-            if (self._account_cache and self._account_cache_timestamp and 
-                (now - self._account_cache_timestamp) < self._account_cache_duration):
-                _LOGGER.warning("Using account data from cache")
+        if age is not None and age < ACCOUNT_CACHE_MAX_STALENESS:
+            _LOGGER.debug("Serving account data %s old while refreshing it", age)
+            self.metrics.record_cache("accounts", hits=1)
+            self._async_refresh_accounts()
+            return self._account_cache
 
-                return self._account_cache
+        self.metrics.record_cache("accounts", misses=1)
+        return await asyncio.shield(self._async_refresh_accounts())
 
-            # Check if we need to login
-            if not self._api_token:
-                if not await self.async_login():
-                    raise InvalidAuth("Failed to login")
+    @callback
+    def _async_refresh_accounts(self) -> asyncio.Task:
+        """Return the running account refresh, starting one if there is none."""
+        if self._account_request is None or self._account_request.done():
+            self._account_request = self._hass.async_create_background_task(
+                self._async_fetch_accounts(), f"{DOMAIN}_accounts_refresh"
+            )
+            self._account_request.add_done_callback(self._async_account_refresh_done)
+        return self._account_request
 
-            try:
-                _LOGGER.warning("Fetching fresh account data")
-                data = await self._async_request(
-                    "GET",
-                    f"{self._url_base}/accounts/v2",
-                    headers=self._get_headers()
-                )
+    @callback
+    def _async_account_refresh_done(self, task: asyncio.Task) -> None:
+        """Hand a refreshed payload to the listeners, or log why the refresh failed."""
+        if task.cancelled():
+            return
+        if (error := task.exception()) is not None:
+            _LOGGER.debug("Account refresh failed, keeping the cached data: %s", error)
+            return
+        for update_callback in list(self._account_listeners):
+            update_callback(task.result())
 
-                if data:
-                    self._account_cache = data
-                    self._account_cache_timestamp = now
-                    return data
+    async def _async_fetch_accounts(self) -> dict:
+        """Fetch /accounts/v2, logging in again once if the token was rejected.
 
-                raise UnknownError("No data received from API")
+        The cached payload is kept when the fetch fails, so it can still be
+        served until it is too stale.
+        """
+        if not self._api_token and not await self.async_login():
+            raise InvalidAuth("Failed to login")
 
-            except InvalidAuth:
-                self._account_cache = None
-                self._account_cache_timestamp = None
-                self._api_token = ""
-                
-                # Try one more time with fresh login
-                if await self.async_login():
-                    data = await self._async_request(
-                        "GET",
-                        f"{self._url_base}/accounts/v2",
-                        headers=self._get_headers()
-                    )
-                    if data:
-                        self._account_cache = data
-                        self._account_cache_timestamp = now
-                        return data
+        _LOGGER.debug("Fetching fresh account data")
+        try:
+            data = await self._async_request(
+                "GET",
+                f"{self._url_base}/accounts/v2",
+                endpoint="accounts",
+                headers=self._get_headers()
+            )
+        except InvalidAuth:
+            self._api_token = ""
+            if not await self.async_login():
                 raise
+            data = await self._async_request(
+                "GET",
+                f"{self._url_base}/accounts/v2",
+                endpoint="accounts",
+                headers=self._get_headers()
+            )
+
+        if not data:
+            raise UnknownError("No data received from API")
 
-    async def get_usage(self, year: str, month: str, day: str) -> Optional[list]:
+        self._account_cache = data
+        self._account_cache_timestamp = dt_util.utcnow()
+        if self._account_store:
+            self._account_store.async_set(self._email, data, self._account_cache_timestamp)
+        return data
+
+    def async_set_password(self, password: str) -> None:
+        """Update the password, dropping the token issued for the old one."""
+        if password != self._password:
+            self._password = password
+            self._api_token = ""
+
+    async def get_usage(
+        self, year: str, month: str, day: str, account_id: str = None, contract_id: str = None
+    ) -> list | None:
         """Get usage data for a specific date."""
+        date_str = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+        return await self._async_get_usage(date_str, date_str, account_id, contract_id)
+
+    async def get_usage_range(
+        self,
+        start: date,
+        end: date,
+        account_id: str = None,
+        contract_id: str = None,
+        interval: str = USAGE_INTERVAL_HOURLY,
+        priority: int = PRIORITY_NORMAL,
+        raise_errors: bool = False,
+    ) -> dict[str, list] | None:
+        """Get usage data for an inclusive date range, grouped by day.
+
+        The range is split into chunks of at most USAGE_RANGE_MAX_DAYS for the
+        interval so a long window costs a handful of requests instead of one
+        per day. Fetching stops at the first chunk that comes back empty or
+        short, since anything after the provider's latest available day will be
+        empty as well. Backfill and imports pass PRIORITY_BACKGROUND so
+        scheduled refreshes are served first.
+
+        Failed requests also return None, unless `raise_errors` is set, so
+        callers that must tell an outage from the end of the history can.
+        """
+        usage: dict[str, list] = {}
+        chunk_start = start
+        max_days = USAGE_RANGE_MAX_DAYS[interval]
+
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=max_days - 1), end)
+            data = await self._async_get_usage(
+                chunk_start.isoformat(),
+                chunk_end.isoformat(),
+                account_id,
+                contract_id,
+                interval=interval,
+                priority=priority,
+                raise_errors=raise_errors,
+            )
+            if not data:
+                break
+
+            for point in data:
+                if point:
+                    usage.setdefault(point["date"][:10], []).append(point)
+
+            if chunk_end.isoformat() not in usage:
+                break
+            chunk_start = chunk_end + timedelta(days=1)
+
+        return usage if usage else None
+
+    async def get_usage_days(
+        self, days: list[date], account_id: str = None, contract_id: str = None
+    ) -> dict[str, list] | None:
+        """Get usage data one request per day, with bounded concurrency.
+
+        Requests are issued concurrently (limited by the usage semaphore) and the
+        results are reassembled in date order, cut off at the first day that has
+        no data.
+        """
+        days = sorted(days)
+        responses = await asyncio.gather(
+            *(
+                self.get_usage(str(day.year), str(day.month), str(day.day), account_id, contract_id)
+                for day in days
+            )
+        )
+
+        usage: dict[str, list] = {}
+        for day, response in zip(days, responses):
+            if not response or not response[0]:
+                _LOGGER.debug("No data available from %s onwards, stopping fetch", day.isoformat())
+                break
+            usage[day.isoformat()] = response
+
+        return usage if usage else None
+
+    async def _async_get_usage(
+        self,
+        date_from: str,
+        date_to: str,
+        account_id: str = None,
+        contract_id: str = None,
+        retry_auth: bool = True,
+        interval: str = USAGE_INTERVAL_HOURLY,
+        priority: int = PRIORITY_NORMAL,
+        raise_errors: bool = False,
+    ) -> list | None:
+        """Get usage data at the given interval between two ISO dates (inclusive).
+
+        Concurrent calls for the same contract, range and interval share one
+        request and its result, so callers must not modify the returned list.
+        A call only joins a request of the same or a more urgent priority, so
+        a sensor update never waits behind the rate limiter's background
+        reserve because a backfill happened to start the same request.
+        Errors are logged and return None unless `raise_errors` is set.
+        """
         if not self._api_token and not await self.async_login():
+            if raise_errors:
+                raise InvalidAuth("Failed to login")
             _LOGGER.error("Failed to login when fetching usage data")
             return None
 
-        if not self._contractId or not self._accountId:
+        account_id = account_id or self._accountId
+        contract_id = contract_id or self._contractId
+        if not contract_id or not account_id:
             _LOGGER.error("Missing contract ID or account ID")
             return None
 
-        date_str = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-        url = f"{self._url_base}/usage/v2/{self._contractId}?ba={self._accountId}&interval=hourly&from={date_str}&to={date_str}"
-        
+        key = (account_id, contract_id, interval, date_from, date_to, priority)
+        request = next(
+            (
+                joined
+                for joinable in sorted({PRIORITY_NORMAL, priority})
+                if (joined := self._usage_requests.get((*key[:-1], joinable))) is not None
+            ),
+            None,
+        )
+        if request is not None:
+            _LOGGER.debug("Joining in-flight usage request for %s to %s", date_from, date_to)
+            self.metrics.record_coalesced("usage")
+        else:
+            request = self._hass.async_create_background_task(
+                self._async_fetch_usage(date_from, date_to, account_id, contract_id, retry_auth, interval, priority),
+                f"{DOMAIN}_usage_{contract_id}_{date_from}_{date_to}",
+            )
+            self._usage_requests[key] = request
+            request.add_done_callback(lambda _: self._usage_requests.pop(key, None))
+
+        try:
+            return await asyncio.shield(request)
+        except (CannotConnect, InvalidAuth, UnknownError) as error:
+            if raise_errors:
+                raise
+            _LOGGER.error("Failed to fetch usage data for %s to %s: %s", date_from, date_to, error)
+            return None
+
+    async def _async_fetch_usage(
+        self,
+        date_from: str,
+        date_to: str,
+        account_id: str,
+        contract_id: str,
+        retry_auth: bool,
+        interval: str,
+        priority: int,
+    ) -> list | None:
+        """Request usage data, logging in again once if the token was rejected.
+
+        Errors are raised, for _async_get_usage to report to every caller.
+        """
+        date_str = date_from if date_from == date_to else f"{date_from} to {date_to}"
+        url = f"{self._url_base}/usage/v2/{contract_id}?ba={account_id}&interval={interval}&from={date_from}&to={date_to}"
+
         _LOGGER.debug("Getting usage data for %s", date_str)
-        
+
         try:
-            data = await self._async_request(
-                "POST", 
-                url, 
-                headers=self._get_headers()
-            )
+            async with self._usage_semaphore:
+                data = await self._async_request(
+                    "POST",
+                    url,
+                    endpoint="usage",
+                    priority=priority,
+                    headers=self._get_headers()
+                )
             if data:
                 _LOGGER.debug("Successfully fetched usage data for %s", date_str)
                 return data
@@ -181,14 +518,170 @@ class ContactEnergyApi:
             
         except InvalidAuth:
             _LOGGER.debug("Token expired, attempting to login again")
-            if await self.async_login():
+            if retry_auth and await self.async_login():
                 # Retry the request with new token
-                return await self.get_usage(year, month, day)
-            return None
-        except Exception as error:
-            _LOGGER.error("Failed to fetch usage data for %s: %s", date_str, error)
-            return None
-        
+                return await self._async_fetch_usage(
+                    date_from, date_to, account_id, contract_id, False, interval, priority
+                )
+            raise
+
+class CircuitBreaker:
+    """Per-client circuit breaker.
+
+    After `failure_threshold` consecutive failed requests the circuit opens
+    and requests fail fast until `reset_timeout` has passed. Then a single
+    trial request is let through (half-open) while the others keep failing
+    fast; success closes the circuit, failure opens it again. A trial that
+    never reports back, say because it was cancelled, is replaced by a new
+    one after another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: timedelta) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being rejected."""
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self._reset_timeout.total_seconds()
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be made now."""
+        if self._opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        # Half-open: let this trial request through, rejecting the others
+        # until it succeeds or fails; a lost trial gets another timeout
+        self._trial_in_flight = True
+        self._opened_at = time.monotonic()
+        self._failures = self._failure_threshold - 1
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self._failures += 1
+        if self._failures >= self._failure_threshold and (self._opened_at is None or self._trial_in_flight):
+            _LOGGER.warning(
+                "Contact Energy API failing, pausing requests for %s", self._reset_timeout
+            )
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class ContactEnergyTokenStore:
+    """Session tokens persisted across restarts, keyed by email."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the token store."""
+        self._store = Store(hass, TOKEN_STORAGE_VERSION, f"{DOMAIN}.tokens")
+        self._tokens: dict[str, str] = {}
+
+    async def async_load(self) -> None:
+        """Load the persisted tokens."""
+        self._tokens = await self._store.async_load() or {}
+
+    def get(self, email: str) -> str:
+        """Return the persisted token for an email, if any."""
+        return self._tokens.get(email.lower(), "")
+
+    @callback
+    def async_set(self, email: str, token: str) -> None:
+        """Persist a token for an email."""
+        self._tokens[email.lower()] = token
+        self._store.async_delay_save(lambda: self._tokens, TOKEN_SAVE_DELAY)
+
+
+class ContactEnergyAccountStore:
+    """Last good account payloads persisted across restarts, keyed by email."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the account store."""
+        self._store = Store(hass, ACCOUNT_CACHE_STORAGE_VERSION, f"{DOMAIN}.accounts")
+        self._accounts: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the persisted payloads."""
+        self._accounts = await self._store.async_load() or {}
+
+    def get(self, email: str) -> tuple[dict | None, datetime | None]:
+        """Return the persisted payload for an email and when it was fetched."""
+        if (stored := self._accounts.get(email.lower())) is None:
+            return None, None
+        return stored["data"], dt_util.parse_datetime(stored["fetched"])
+
+    @callback
+    def async_set(self, email: str, data: dict, fetched: datetime) -> None:
+        """Persist the payload for an email."""
+        self._accounts[email.lower()] = {"data": data, "fetched": fetched.isoformat()}
+        self._store.async_delay_save(lambda: self._accounts, ACCOUNT_CACHE_SAVE_DELAY)
+
+
+async def async_get_api(hass: HomeAssistant, email: str, password: str) -> ContactEnergyApi:
+    """Return the shared API client for a Contact Energy login.
+
+    Every config entry and platform use the same client for a given email, so
+    they share one session token (persisted across restarts and only refreshed
+    when the API answers 401) and one account cache.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    lock = domain_data.setdefault(DATA_CLIENTS_LOCK, asyncio.Lock())
+
+    async with lock:
+        if (token_store := domain_data.get(DATA_TOKEN_STORE)) is None:
+            token_store = ContactEnergyTokenStore(hass)
+            await token_store.async_load()
+            domain_data[DATA_TOKEN_STORE] = token_store
+
+        if (account_store := domain_data.get(DATA_ACCOUNT_STORE)) is None:
+            account_store = ContactEnergyAccountStore(hass)
+            await account_store.async_load()
+            domain_data[DATA_ACCOUNT_STORE] = account_store
+
+        clients = domain_data.setdefault(DATA_CLIENTS, {})
+        if (api := clients.get(email.lower())) is None:
+            api = ContactEnergyApi(
+                hass,
+                email,
+                password,
+                token_store=token_store,
+                rate_limiter=async_get_rate_limiter(hass),
+                account_store=account_store,
+            )
+            clients[email.lower()] = api
+        else:
+            api.async_set_password(password)
+
+    return api
+
+
+@callback
+def async_update_api_password(hass: HomeAssistant, email: str, password: str) -> None:
+    """Hand a password the config flow has validated to the shared client, if any."""
+    if (api := hass.data.get(DOMAIN, {}).get(DATA_CLIENTS, {}).get(email.lower())) is not None:
+        api.async_set_password(password)
+
+
+@callback
+def async_remove_api(hass: HomeAssistant, email: str) -> None:
+    """Drop the shared client of a login that could not be validated."""
+    hass.data.get(DOMAIN, {}).get(DATA_CLIENTS, {}).pop(email.lower(), None)
+
+
+class _ServerError(Exception):
+    """A 5xx response, retried by the request policy."""
+
+
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
 
@@ -196,4 +689,6 @@ class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
 class UnknownError(HomeAssistantError):
-    """Error to indicate an unknown error occurred."""
\ No newline at end of file
+    """Error to indicate an unknown error occurred."""
+class RequestRejected(UnknownError):
+    """Error to indicate the API rejected a request with a 4xx response."""
@@ -0,0 +1,311 @@
+"""Resumable historical usage backfill for Contact Energy."""
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistic_during_period,
+    statistics_during_period,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import ContactEnergyApi
+from .const import (
+    BACKFILL_CHUNK_DAYS,
+    BACKFILL_CHUNK_DELAY,
+    BACKFILL_RETRY_DELAY,
+    BACKFILL_STORAGE_VERSION,
+    DOMAIN,
+    USAGE_INTERVAL_HOURLY,
+)
+from .ratelimit import PRIORITY_BACKGROUND
+from .statistics import StatisticIds, build_metadata, statistic_ids
+from .usage import HourlyUsage
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_WAITING = "waiting"
+STATUS_COMPLETE = "complete"
+
+
+def backfill_store(hass: HomeAssistant, icp: str, interval: str = USAGE_INTERVAL_HOURLY) -> Store:
+    """Return the checkpoint store for an ICP's backfill at an interval."""
+    if interval == USAGE_INTERVAL_HOURLY:
+        return Store(hass, BACKFILL_STORAGE_VERSION, f"{DOMAIN}.backfill_{icp}")
+    return Store(hass, BACKFILL_STORAGE_VERSION, f"{DOMAIN}.backfill_{interval}_{icp}")
+
+
+class ContactEnergyBackfill:
+    """Import usage history backwards, in chunks, down to a target date.
+
+    The steady-state updater only ever imports the recent window. This job
+    walks backwards from the oldest stored statistic, deriving each older
+    hour's sum from the one after it, so existing rows never need rewriting.
+    A checkpoint is saved after every chunk so the job resumes after a restart.
+
+    At a daily interval the history before the oldest hourly row is imported
+    into the separate daily statistics instead, a day per row, continuing
+    down from the same sums so both series line up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: ContactEnergyApi,
+        icp: str,
+        account_id: str,
+        contract_id: str,
+        target: date,
+        ids: StatisticIds,
+        interval: str = USAGE_INTERVAL_HOURLY,
+    ) -> None:
+        """Initialize the backfill job."""
+        self._hass = hass
+        self._api = api
+        self._icp = icp
+        self._account_id = account_id
+        self._contract_id = contract_id
+        self._ids = ids
+        self._interval = interval
+        self._chunk_days = BACKFILL_CHUNK_DAYS[interval]
+        # The hourly statistics anchor the job; rows go to the interval's own
+        self._import_ids = ids if interval == USAGE_INTERVAL_HOURLY else statistic_ids(icp, interval=interval)
+        self._store = backfill_store(hass, icp, interval)
+        self._listeners: list[Callable[[], None]] = []
+        self._checkpoint: dict[str, Any] = {}
+        self._chunks_this_run = 0
+        self._run_started: datetime | None = None
+        self.target = target
+        self.status = STATUS_PENDING
+
+    @property
+    def next_end(self) -> date | None:
+        """Return the newest day still left to import."""
+        if next_end := self._checkpoint.get("next_end"):
+            return date.fromisoformat(next_end)
+        return None
+
+    @property
+    def progress(self) -> float | None:
+        """Return backfill progress as a percentage."""
+        if self.status == STATUS_COMPLETE:
+            return 100.0
+        if not self._checkpoint:
+            return None
+        first = date.fromisoformat(self._checkpoint["first"])
+        total = (first - self.target).days + 1
+        if total <= 0:
+            return 100.0
+        return round(100 * (first - self.next_end).days / total, 1)
+
+    @property
+    def eta(self) -> datetime | None:
+        """Return the estimated completion time based on this run's pace."""
+        if self.status != STATUS_RUNNING or not self._chunks_this_run:
+            return None
+        remaining_days = (self.next_end - self.target).days + 1
+        remaining_chunks = -(-remaining_days // self._chunk_days)
+        per_chunk = (dt_util.utcnow() - self._run_started) / self._chunks_this_run
+        return dt_util.utcnow() + per_chunk * remaining_chunks
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for progress updates."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify listeners of a progress change."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    async def async_run(self) -> None:
+        """Run the backfill until the target date is reached."""
+        self._checkpoint = await self._store.async_load() or {}
+        self._run_started = dt_util.utcnow()
+
+        while self.status != STATUS_COMPLETE:
+            try:
+                if not self._checkpoint and not await self._async_init_checkpoint():
+                    self.status = STATUS_WAITING
+                    self._async_notify()
+                    await asyncio.sleep(BACKFILL_RETRY_DELAY.total_seconds())
+                    continue
+
+                if self.next_end < self.target:
+                    _LOGGER.info("Usage backfill for %s complete", self._icp)
+                    self.status = STATUS_COMPLETE
+                    self._async_notify()
+                    return
+
+                self.status = STATUS_RUNNING
+                if not await self._async_import_chunk():
+                    _LOGGER.info("No usage history on or before %s, backfill complete", self.next_end)
+                    self.status = STATUS_COMPLETE
+                    self._async_notify()
+                    return
+
+                self._chunks_this_run += 1
+                self._async_notify()
+                await asyncio.sleep(BACKFILL_CHUNK_DELAY.total_seconds())
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                _LOGGER.error("Error during usage backfill, retrying later: %s", error)
+                self.status = STATUS_WAITING
+                self._async_notify()
+                await asyncio.sleep(BACKFILL_RETRY_DELAY.total_seconds())
+
+    async def _async_has_rows(self, start: datetime, end: datetime) -> bool:
+        """Return whether the first statistic has a row in [start, end)."""
+        result = await get_instance(self._hass).async_add_executor_job(
+            statistic_during_period, self._hass, start, end, self._ids[0], {"change"}, None
+        )
+        return result.get("change") is not None
+
+    async def _async_find_oldest_day(self) -> datetime | None:
+        """Return the start of a day-long window holding the oldest row since the target.
+
+        Bisects between the target and now with single-row lookups, so the
+        cost does not grow with the amount of stored history.
+        """
+        low = dt_util.as_utc(dt_util.start_of_local_day(self.target))
+        high = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        if not await self._async_has_rows(low, high):
+            return None
+        while high - low > timedelta(days=1):
+            middle = (low + (high - low) / 2).replace(minute=0, second=0, microsecond=0)
+            if await self._async_has_rows(low, middle):
+                high = middle
+            else:
+                low = middle
+        return low
+
+    async def _async_init_checkpoint(self) -> bool:
+        """Anchor the backfill on the oldest stored statistic row."""
+        stats = {}
+        if (start_time := await self._async_find_oldest_day()) is not None:
+            stats = await get_instance(self._hass).async_add_executor_job(
+                statistics_during_period,
+                self._hass,
+                start_time,
+                start_time + timedelta(days=1),
+                set(self._ids),
+                "hour",
+                None,
+                {"sum"},
+            )
+        if not all(stats.get(statistic_id) for statistic_id in self._ids):
+            _LOGGER.debug("No stored usage statistics yet, waiting before backfilling")
+            return False
+
+        anchor = stats[self._ids[0]][0]["start"]
+        if isinstance(anchor, datetime):
+            anchor = anchor.timestamp()
+        anchor_sums = {}
+        for statistic_id in self._ids:
+            row = stats[statistic_id][0]
+            anchor_sums[statistic_id] = row["sum"] or 0
+
+        # The sum just before the anchor hour is the anchor's sum minus its own usage.
+        anchor_day = dt_util.as_local(dt_util.utc_from_timestamp(anchor)).date()
+        usage = await self._api.get_usage_range(
+            anchor_day,
+            anchor_day,
+            self._account_id,
+            self._contract_id,
+            priority=PRIORITY_BACKGROUND,
+            raise_errors=True,
+        ) or {}
+        day_usage = HourlyUsage.from_points(usage.get(anchor_day.isoformat()))
+        anchor_usage = (0.0, 0.0, 0.0)
+        for index, hour in enumerate(day_usage.hours):
+            if hour * 3600 == anchor:
+                anchor_usage = (day_usage.kwh[index], day_usage.dollars[index], day_usage.free_kwh[index])
+                break
+
+        # Coarser rows start at local midnight, so they stop at the day before
+        # the anchor's; the hours of that day before the anchor stay missing.
+        if self._interval != USAGE_INTERVAL_HOURLY:
+            anchor = dt_util.start_of_local_day(anchor_day).timestamp()
+            anchor_day -= timedelta(days=1)
+
+        self._checkpoint = {
+            "first": anchor_day.isoformat(),
+            "next_end": anchor_day.isoformat(),
+            "anchor": anchor,
+            "baselines": {
+                import_id: anchor_sums[statistic_id] - value
+                for import_id, statistic_id, value in zip(self._import_ids, self._ids, anchor_usage)
+            },
+            "currency": "NZD",
+        }
+        await self._store.async_save(self._checkpoint)
+        self._async_notify()
+        return True
+
+    async def _async_import_chunk(self) -> bool:
+        """Import the next chunk before the anchor. Return False when there is no more data."""
+        anchor = self._checkpoint["anchor"]
+        chunk_end = self.next_end
+        chunk_start = max(chunk_end - timedelta(days=self._chunk_days - 1), self.target)
+
+        _LOGGER.debug("Backfilling %s usage from %s to %s", self._interval, chunk_start, chunk_end)
+        # Errors are raised so an outage is retried; only an empty response
+        # means the provider's history is exhausted
+        usage = await self._api.get_usage_range(
+            chunk_start,
+            chunk_end,
+            self._account_id,
+            self._contract_id,
+            self._interval,
+            PRIORITY_BACKGROUND,
+            raise_errors=True,
+        )
+        if not usage:
+            return False
+
+        aggregated = self._interval != USAGE_INTERVAL_HOURLY
+        chunk = HourlyUsage.concat(HourlyUsage.from_points(points, aggregated) for points in usage.values())
+        if chunk.currency:
+            self._checkpoint["currency"] = chunk.currency
+
+        baselines = self._checkpoint["baselines"]
+        columns = tuple(zip(self._import_ids, (chunk.kwh, chunk.dollars, chunk.free_kwh)))
+        statistics = {statistic_id: [] for statistic_id in self._import_ids}
+        for index in sorted(range(len(chunk)), key=chunk.hours.__getitem__, reverse=True):
+            timestamp = chunk.hours[index] * 3600
+            if timestamp >= anchor:
+                continue
+            start = chunk.start(index)
+            for statistic_id, values in columns:
+                statistics[statistic_id].append(StatisticData(start=start, sum=baselines[statistic_id]))
+                baselines[statistic_id] -= values[index]
+            anchor = timestamp
+
+        metadata = build_metadata(self._icp, self._checkpoint["currency"], self._import_ids, self._interval)
+        for statistic_id, rows in statistics.items():
+            if rows:
+                rows.reverse()
+                async_add_external_statistics(self._hass, metadata[statistic_id], rows)
+
+        self._checkpoint["anchor"] = anchor
+        self._checkpoint["next_end"] = (chunk_start - timedelta(days=1)).isoformat()
+        await self._store.async_save(self._checkpoint)
+        return True
@@ -0,0 +1,197 @@
+"""Record and replay raw Contact Energy API responses.
+
+ResponseRecorder appends every response the API client receives to a
+gzip-compressed JSON lines file, with credentials scrubbed. ReplaySession
+serves such a file back to ContactEnergyApi in place of the aiohttp session,
+so slow or wrong updates can be reproduced and profiled offline.
+"""
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from yarl import URL
+
+from .const import CAPTURE_DIRECTORY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Response fields replaced before anything is written to disk, matched
+# case-insensitively at any depth: credentials and anything naming a person,
+# phone number or address are redacted, while account, contract and ICP ids
+# get a pseudonym that stays the same within one capture, so the ids in the
+# recorded URLs still match and the capture can be replayed.
+SCRUBBED_KEYS = {"token", "session", "username", "password", "email", "emailaddress"}
+SCRUBBED_KEY_PARTS = ("name", "phone", "mobile", "address", "email")
+SCRUBBED_VALUE = "**REDACTED**"
+PSEUDONYMIZED_KEYS = {"id", "icp", "accountid", "contractid", "ba"}
+USAGE_PATH = "/usage/v2/"
+
+# Answer to a replayed login the capture does not contain.
+LOGIN_PATH = "/login/v2"
+REPLAY_TOKEN = "replay"
+
+
+def _scrub_key(key: str) -> bool:
+    """Return whether the value of a key is redacted."""
+    key = key.lower()
+    return key in SCRUBBED_KEYS or any(part in key for part in SCRUBBED_KEY_PARTS)
+
+
+def scrub(data: Any, pseudonym: Callable[[Any], str] = lambda value: SCRUBBED_VALUE) -> Any:
+    """Return a copy of a JSON payload with personal fields redacted or pseudonymized."""
+    if isinstance(data, dict):
+        return {
+            key: (
+                SCRUBBED_VALUE if _scrub_key(key)
+                else pseudonym(value) if key.lower() in PSEUDONYMIZED_KEYS and isinstance(value, str | int)
+                else scrub(value, pseudonym)
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [scrub(value, pseudonym) for value in data]
+    return data
+
+
+def scrub_path(url: str, pseudonym: Callable[[Any], str]) -> str:
+    """Return the path and query of a URL with the account and contract ids pseudonymized."""
+    url = URL(url)
+    path = url.path
+    if path.startswith(USAGE_PATH):
+        path = USAGE_PATH + pseudonym(url.name)
+    query = {
+        key: pseudonym(value) if key.lower() in PSEUDONYMIZED_KEYS else value
+        for key, value in url.query.items()
+    }
+    return URL.build(path=path, query=query).path_qs
+
+
+def capture_path(hass: HomeAssistant) -> str:
+    """Return the path of a new capture file."""
+    name = dt_util.utcnow().strftime("%Y%m%d-%H%M%S")
+    return hass.config.path(CAPTURE_DIRECTORY, f"{name}.jsonl.gz")
+
+
+def read_capture(path: str) -> list[dict[str, Any]]:
+    """Read all responses from a capture file."""
+    with gzip.open(path, "rt", encoding="utf-8") as capture_file:
+        return [json.loads(line) for line in capture_file if line.strip()]
+
+
+class ResponseRecorder:
+    """Append scrubbed API responses to a compressed capture file."""
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._lock = threading.Lock()
+        # Keys the pseudonyms, so they can't be reversed by hashing candidate ids
+        self._key = secrets.token_bytes(32)
+        self.path = path
+
+    def _pseudonym(self, value: Any) -> str:
+        """Return the pseudonym of an identifier in this capture."""
+        digest = hmac.new(self._key, str(value).encode(), hashlib.sha256).hexdigest()
+        return f"x{digest[:15]}"
+
+    @callback
+    def async_record(
+        self, method: str, url: str, endpoint: str, status: int, body: bytes, elapsed: float
+    ) -> None:
+        """Record one response; scrubbing and writing happen in the executor."""
+        entry = {
+            "method": method,
+            "url": url,
+            "endpoint": endpoint,
+            "status": status,
+            "elapsed": round(elapsed, 3),
+        }
+        self._hass.async_add_executor_job(self._write, entry, body)
+
+    def _write(self, entry: dict[str, Any], body: bytes) -> None:
+        """Append a response to the capture file as its own gzip member."""
+        entry["path"] = scrub_path(entry.pop("url"), self._pseudonym)
+        try:
+            entry["body"] = scrub(json.loads(body), self._pseudonym) if body else None
+        except ValueError:
+            entry["body"] = None
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as capture_file:
+                capture_file.write(line + "\n")
+
+
+class _ReplayResponse:
+    """Recorded response, with the parts of aiohttp.ClientResponse the client uses."""
+
+    def __init__(self, status: int, body: Any, delay: float) -> None:
+        """Initialize the response."""
+        self.status = status
+        self._body = body
+        self._delay = delay
+
+    async def __aenter__(self) -> "_ReplayResponse":
+        """Return the response after the recorded latency, if replaying in real time."""
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Release the response."""
+        return None
+
+    async def read(self) -> bytes:
+        """Return the body as bytes."""
+        return json.dumps(self._body).encode() if self._body is not None else b""
+
+    async def json(self) -> Any:
+        """Return the decoded body."""
+        return self._body
+
+
+class ReplaySession:
+    """Stand-in for aiohttp.ClientSession that serves a capture file.
+
+    Responses are matched on method, path and query. Repeated requests get the
+    recorded responses in order, then the last one again; unknown requests
+    get a 404. Most captures hold no login, since a token restored across
+    restarts is used without one, so an unrecorded login is answered with a
+    dummy token. With `realtime` the recorded latency is reproduced.
+    """
+
+    def __init__(self, entries: list[dict[str, Any]], realtime: bool = False) -> None:
+        """Initialize the session."""
+        self.entries = entries
+        self._realtime = realtime
+        self._responses: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+        for entry in entries:
+            self._responses.setdefault((entry["method"], entry["path"]), deque()).append(entry)
+
+    @classmethod
+    def from_file(cls, path: str, realtime: bool = False) -> "ReplaySession":
+        """Create a session from a capture file."""
+        return cls(read_capture(path), realtime)
+
+    def request(self, method: str, url: str, **kwargs) -> _ReplayResponse:
+        """Return the recorded response for a request."""
+        path = URL(url).path_qs
+        responses = self._responses.get((method, path))
+        if not responses and path == LOGIN_PATH:
+            return _ReplayResponse(200, {"token": REPLAY_TOKEN}, 0)
+        if not responses:
+            _LOGGER.debug("No recorded response for %s %s", method, url)
+            return _ReplayResponse(404, None, 0)
+        entry = responses.popleft() if len(responses) > 1 else responses[0]
+        return _ReplayResponse(entry["status"], entry["body"], entry["elapsed"] if self._realtime else 0)
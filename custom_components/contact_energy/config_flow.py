@@ -10,14 +10,33 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 import homeassistant.helpers.config_validation as cv
-
-from .api import ContactEnergyApi, CannotConnect, InvalidAuth, UnknownError
+from homeassistant.helpers import selector
+
+from .api import (
+    ContactEnergyApi,
+    async_update_api_password,
+    CannotConnect,
+    InvalidAuth,
+    UnknownError,
+)
+from .ratelimit import async_get_rate_limiter
 from .const import (
     DOMAIN,
     CONF_USAGE_DAYS,
+    CONF_INCREMENTAL_IMPORT,
+    CONF_BACKFILL_START,
+    CONF_BACKFILL_INTERVAL,
+    CONF_RECORD_RESPONSES,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_GAP_SCAN_DAYS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_GAP_SCAN_DAYS,
     CONF_ACCOUNT_ID,
     CONF_CONTRACT_ID,
-    CONF_CONTRACT_ICP
+    CONF_CONTRACT_ICP,
+    CONF_CONTRACTS,
+    USAGE_INTERVAL_HOURLY,
+    USAGE_INTERVALS
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,6 +46,14 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_EMAIL): cv.string,
         vol.Required(CONF_PASSWORD): cv.string,
         vol.Optional(CONF_USAGE_DAYS, default=10): cv.positive_int,
+        vol.Optional(CONF_INCREMENTAL_IMPORT, default=True): cv.boolean,
+        vol.Optional(CONF_BACKFILL_START): selector.DateSelector(),
+        vol.Optional(CONF_BACKFILL_INTERVAL, default=USAGE_INTERVAL_HOURLY): vol.In(USAGE_INTERVALS),
+        vol.Optional(CONF_RECORD_RESPONSES, default=False): cv.boolean,
+        vol.Optional(CONF_REQUESTS_PER_MINUTE, default=DEFAULT_REQUESTS_PER_MINUTE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(CONF_GAP_SCAN_DAYS, default=DEFAULT_GAP_SCAN_DAYS): cv.positive_int,
     }
 )
 
@@ -35,7 +62,11 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     _LOGGER.debug("Starting validation for email: %s", data[CONF_EMAIL])
     
     try:
-        api = ContactEnergyApi(hass, data[CONF_EMAIL], data[CONF_PASSWORD])
+        # A throwaway client, so a mistyped password never reaches the client
+        # shared with running entries for the same email
+        api = ContactEnergyApi(
+            hass, data[CONF_EMAIL], data[CONF_PASSWORD], rate_limiter=async_get_rate_limiter(hass)
+        )
         if not await api.async_login():
             _LOGGER.error("Login failed for email: %s", data[CONF_EMAIL])
             raise InvalidAuth
@@ -63,6 +94,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
             raise UnknownError("No electricity contracts found")
         
         _LOGGER.info("Successfully authenticated Contact Energy account: %s", data[CONF_EMAIL])
+        async_update_api_password(hass, data[CONF_EMAIL], data[CONF_PASSWORD])
         return {
             "title": f"Contact Energy ({data[CONF_EMAIL]})",
             "email": data[CONF_EMAIL],
@@ -86,7 +118,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 class ContactEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Contact Energy."""
 
-    VERSION = 1
+    VERSION = 2
 
     def __init__(self):
         """Initialize the config flow."""
@@ -103,26 +135,23 @@ class ContactEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 self._validated_data = await validate_input(self.hass, user_input)
-                self._contracts = self._validated_data["contracts"]
                 self._current_input.update(user_input)
-                
+
+                # Contracts already tracked by another entry are not offered again
+                configured = self._configured_contract_ids()
+                self._contracts = [
+                    contract for contract in self._validated_data["contracts"]
+                    if contract["id"] not in configured
+                ]
+                if not self._contracts:
+                    return self.async_abort(reason="already_configured")
+
                 # If only one contract is available, skip the selection step
                 if len(self._contracts) == 1:
-                    contract = self._contracts[0]
-                    user_input[CONF_ACCOUNT_ID] = contract["account_id"]
-                    user_input[CONF_CONTRACT_ID] = contract["id"]
-                    user_input[CONF_CONTRACT_ICP] = contract["icp"]
-                    
-                    await self.async_set_unique_id(contract["id"])
-                    self._abort_if_unique_id_configured()
-                    
-                    return self.async_create_entry(
-                        title=f"{self._validated_data['title']} - {contract['address']}",
-                        data=user_input
-                    )
-                
+                    return await self._async_create_contracts_entry(self._contracts)
+
                 return await self.async_step_contract()
-                
+
             except InvalidAuth:
                 errors["base"] = "invalid_auth"
             except CannotConnect:
@@ -145,32 +174,22 @@ class ContactEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_contract(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle contract selection step."""
+        """Handle contract selection step; several contracts can share one entry."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            selected_contract = next(
-                (c for c in self._contracts if c["id"] == user_input[CONF_CONTRACT_ID]),
-                None
-            )
-            if selected_contract:
-                self._current_input[CONF_ACCOUNT_ID] = selected_contract["account_id"]
-                self._current_input[CONF_CONTRACT_ID] = selected_contract["id"]
-                self._current_input[CONF_CONTRACT_ICP] = selected_contract['icp']
-                
-                await self.async_set_unique_id(selected_contract["id"])
-                self._abort_if_unique_id_configured()
-                
-                return self.async_create_entry(
-                    title=f"{self._validated_data['title']} - {selected_contract['address']}",
-                    data=self._current_input
-                )
-            else:
-                errors["base"] = "invalid_contract"
+            selected_contracts = [
+                c for c in self._contracts if c["id"] in user_input[CONF_CONTRACTS]
+            ]
+            if selected_contracts:
+                return await self._async_create_contracts_entry(selected_contracts)
+            errors["base"] = "invalid_contract"
 
         # Create schema for contract selection
         contract_schema = vol.Schema({
-            vol.Required(CONF_CONTRACT_ID): vol.In({
+            vol.Required(
+                CONF_CONTRACTS, default=[c["id"] for c in self._contracts]
+            ): cv.multi_select({
                 c["id"]: f"{c['id']} - {c['address']}"
                 for c in self._contracts
             }),
@@ -180,4 +199,28 @@ class ContactEnergyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="contract",
             data_schema=contract_schema,
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+    def _configured_contract_ids(self) -> set[str]:
+        """Return the ids of the contracts tracked by existing entries."""
+        return {
+            contract[CONF_CONTRACT_ID]
+            for entry in self._async_current_entries(include_ignore=False)
+            for contract in entry.data.get(CONF_CONTRACTS, [])
+        }
+
+    async def _async_create_contracts_entry(self, contracts: list[dict[str, Any]]) -> FlowResult:
+        """Create an entry tracking the given contracts."""
+        await self.async_set_unique_id(contracts[0]["id"])
+        self._abort_if_unique_id_configured()
+
+        self._current_input[CONF_ACCOUNT_ID] = contracts[0]["account_id"]
+        self._current_input[CONF_CONTRACTS] = [
+            {CONF_CONTRACT_ID: c["id"], CONF_CONTRACT_ICP: c["icp"]} for c in contracts
+        ]
+        if len(contracts) == 1:
+            title = f"{self._validated_data['title']} - {contracts[0]['address']}"
+        else:
+            title = f"{self._validated_data['title']} - {len(contracts)} contracts"
+
+        return self.async_create_entry(title=title, data=self._current_input)
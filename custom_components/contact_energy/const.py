@@ -1,5 +1,6 @@
 """Constants for the Contact Energy sensors."""
 
+from datetime import timedelta
 from typing import Final, final
 
 DOMAIN = "contact_energy"
@@ -16,17 +17,151 @@ SENSOR_PAYMENT_DUE_NAME = "Payment Due"
 SENSOR_PAYMENT_DUE_DATE_NAME = "Payment Due Date"
 SENSOR_PREVIOUS_READING_DATE_NAME = "Previous Reading Date"
 SENSOR_NEXT_READING_DATE_NAME = "Next Reading Date"
+SENSOR_BACKFILL_NAME = "Backfill Progress"
+SENSOR_API_REQUESTS_NAME = "API Requests"
+SENSOR_USAGE_UPDATE_DURATION_NAME = "Usage Update Duration"
+SENSOR_CACHE_HIT_RATIO_NAME = "Usage Cache Hit Ratio"
 
+ACCOUNT_SCAN_INTERVAL = timedelta(hours=8)
+
+# Account payloads younger than the TTL are served as is; older ones are
+# served while a background refresh runs, up to the maximum staleness. The last
+# good payload is persisted so a cold start has one to serve.
+ACCOUNT_CACHE_TTL = timedelta(minutes=15)
+ACCOUNT_CACHE_MAX_STALENESS = timedelta(hours=24)
+ACCOUNT_CACHE_SAVE_DELAY = 10
+ACCOUNT_CACHE_STORAGE_VERSION = 1
+
+# Longest platform setup waits on the network at startup. Entities are added
+# with their restored state; anything slower carries on in the background.
+STARTUP_TIME_BUDGET = timedelta(seconds=10)
+
+# State attributes that change on every update; excluded from the recorder.
+ATTR_LAST_UPDATED = "last_updated"
+ATTR_ETA = "eta"
+
+API_URL_BASE = "https://api.contact-digital-prod.net"
+
+# Directory, relative to the Home Assistant config directory, that recorded
+# API responses are written to when response recording is enabled.
+CAPTURE_DIRECTORY = "contact_energy_captures"
+
+# Request policy: per-endpoint timeouts (seconds), retries with jittered
+# exponential backoff for timeouts and 5xx within a total time budget
+# (seconds), and a per-client circuit breaker.
+REQUEST_TIMEOUTS = {
+    "default": 30,
+    "login": 20,
+    "accounts": 30,
+    "usage": 60,
+}
+REQUEST_MAX_RETRIES = 3
+REQUEST_BACKOFF_BASE = 1.0
+REQUEST_BACKOFF_MAX = 30.0
+REQUEST_RETRY_BUDGET = 120.0
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = timedelta(minutes=5)
+
+# Adaptive usage polling. New usage typically appears a couple of days after
+# the end of the day it covers; the actual lag is learned per ICP.
+POLL_DEFAULT_LAG = timedelta(hours=48)
+POLL_LAG_SAMPLES = 14
+POLL_MIN_WINDOW = timedelta(hours=2)
+POLL_FAST_INTERVAL = timedelta(hours=1)
+POLL_SLOW_INTERVAL = timedelta(hours=6)
+POLL_RETRY_INTERVAL = timedelta(hours=1)
+POLL_SAVE_DELAY = 10
+POLL_STORAGE_VERSION = 1
+
+# Keys shared by all entries in hass.data[DOMAIN]
+DATA_CLIENTS = "clients"
+DATA_CLIENTS_LOCK = "clients_lock"
+DATA_TOKEN_STORE = "token_store"
+DATA_ACCOUNT_STORE = "account_store"
+DATA_IMPORTS = "imports"
+DATA_RATE_LIMITER = "rate_limiter"
+
+# Token bucket shared by every client of the instance. Background backfill and
+# import requests leave RATE_LIMIT_PRIORITY_RESERVE tokens for scheduled ones.
+DEFAULT_REQUESTS_PER_MINUTE = 120
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_PRIORITY_RESERVE = 3
+TOKEN_STORAGE_VERSION = 1
+TOKEN_SAVE_DELAY = 10
+
+# Resolutions requested from /usage/v2. Recent usage is imported hourly;
+# older history can be imported daily, at a 24th of the payload.
+USAGE_INTERVAL_HOURLY = "hourly"
+USAGE_INTERVAL_DAILY = "daily"
+USAGE_INTERVALS = [USAGE_INTERVAL_HOURLY, USAGE_INTERVAL_DAILY]
+
+# Longest from/to span requested from /usage/v2 in a single call, per interval.
+USAGE_RANGE_MAX_DAYS = {
+    USAGE_INTERVAL_HOURLY: 31,
+    USAGE_INTERVAL_DAILY: 366,
+}
+# Maximum number of /usage/v2 requests in flight per API client.
+USAGE_MAX_CONCURRENCY = 4
+
+# Usage older than this many days is considered settled and is cached for good.
+USAGE_SETTLEMENT_DAYS = 7
+USAGE_CACHE_MAX_DAYS = 400
+USAGE_CACHE_SAVE_DELAY = 30
+USAGE_CACHE_STORAGE_VERSION = 2
+
+# Days imported per backfill chunk, per interval.
+BACKFILL_CHUNK_DAYS = {
+    USAGE_INTERVAL_HOURLY: 14,
+    USAGE_INTERVAL_DAILY: 366,
+}
+BACKFILL_CHUNK_DELAY = timedelta(seconds=60)
+BACKFILL_RETRY_DELAY = timedelta(hours=1)
+BACKFILL_STORAGE_VERSION = 1
+
+# Gap repair: missing hours are looked for over the last CONF_GAP_SCAN_DAYS
+# days, first shortly after setup and then daily. Gaps closer together than
+# GAP_MERGE_DAYS days are fetched as one range.
+DEFAULT_GAP_SCAN_DAYS = 30
+GAP_SCAN_DELAY = timedelta(minutes=10)
+GAP_SCAN_INTERVAL = timedelta(hours=24)
+GAP_MERGE_DAYS = 2
+
+# import_usage_range service: rows per statistic handed to the recorder at a
+# time, and the event fired as an import progresses.
+SERVICE_IMPORT_USAGE_RANGE = "import_usage_range"
+IMPORT_BATCH_ROWS = 500
+EVENT_IMPORT_PROGRESS = f"{DOMAIN}_import_progress"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_ICP = "icp"
+ATTR_INTERVAL = "interval"
+
+# Usage statistics are imported as f"{DOMAIN}:{object_id}_{icp}" per contract,
+# and daily history as f"{DOMAIN}:{object_id}_daily_{icp}".
+STATISTIC_ENERGY = "energy_consumption"
+STATISTIC_ENERGY_DOLLARS = "energy_consumption_in_dollars"
+STATISTIC_FREE_ENERGY = "free_energy_consumption"
+STATISTIC_PAYMENTS = "payments"
 
 CONF_ACCOUNT_ID = "account_id"
 CONF_CONTRACT_ID = "contract_id"
 CONF_CONTRACT_ICP = "contract_icp"
+CONF_CONTRACTS = "contracts"
+# Set on the contract of an entry migrated from a single-contract entry, which
+# keeps importing to the original unsuffixed statistic ids.
+CONF_LEGACY_STATISTICS = "legacy_statistics"
 CONF_PRICES = "prices"
 CONF_USAGE = "usage"
 CONF_SOLD = "sold"
 CONF_SOLD_MEASURE = "sold_measure"
 CONF_SOLD_DAILY = "sold_daily"
 CONF_USAGE_DAYS = "usage_days"
+CONF_INCREMENTAL_IMPORT = "incremental_import"
+CONF_BACKFILL_START = "backfill_start"
+CONF_BACKFILL_INTERVAL = "backfill_interval"
+CONF_RECORD_RESPONSES = "record_responses"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+CONF_GAP_SCAN_DAYS = "gap_scan_days"
 CONF_SHOW_HOURLY = "show_hourly"
 CONF_DATE_FORMAT = "date_format"
 CONF_TIME_FORMAT = "time_format"
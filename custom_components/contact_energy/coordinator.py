@@ -0,0 +1,50 @@
+"""Contact Energy data update coordinators."""
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from custom_components.contact_energy.api import (
+    CannotConnect,
+    ContactEnergyApi,
+    InvalidAuth,
+    UnknownError,
+)
+from custom_components.contact_energy.const import ACCOUNT_SCAN_INTERVAL, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ContactEnergyAccountCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Fetch /accounts/v2 once per cycle and share it with every account sensor."""
+
+    def __init__(self, hass: HomeAssistant, api: ContactEnergyApi, account_id: str) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_accounts_{account_id}",
+            update_interval=ACCOUNT_SCAN_INTERVAL,
+        )
+        self.api = api
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch account details from the API."""
+        try:
+            data = await self.api.async_get_accounts()
+        except InvalidAuth as error:
+            raise UpdateFailed(f"Authentication error fetching accounts: {error}") from error
+        except (CannotConnect, UnknownError) as error:
+            raise UpdateFailed(f"Error fetching accounts: {error}") from error
+
+        if not data or "accountDetail" not in data:
+            raise UpdateFailed("No account details received from API")
+
+        return data
+
+    @callback
+    def async_handle_refreshed_accounts(self, data: dict[str, Any]) -> None:
+        """Publish account data fetched by a background refresh of the client's cache."""
+        if data and "accountDetail" in data:
+            self.async_set_updated_data(data)
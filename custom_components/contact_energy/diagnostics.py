@@ -0,0 +1,34 @@
+"""Diagnostics support for Contact Energy."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_ACCOUNT_ID, CONF_CONTRACT_ICP, CONF_CONTRACT_ID, DOMAIN
+from .ratelimit import async_get_rate_limiter
+
+# The entry title holds the account email, as in "Contact Energy (<email>)",
+# the unique id is the first contract id and an ICP identifies a supply address
+TO_REDACT = {
+    CONF_ACCOUNT_ID,
+    CONF_CONTRACT_ICP,
+    CONF_CONTRACT_ID,
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_UNIQUE_ID,
+    "title",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including API performance metrics."""
+    api = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "circuit_breaker_open": api.circuit_breaker_open,
+        "account_cache_age": age.total_seconds() if (age := api.account_cache_age) is not None else None,
+        "metrics": api.metrics.as_dict(),
+        "rate_limiter": async_get_rate_limiter(hass).as_dict(),
+    }
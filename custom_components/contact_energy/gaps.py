@@ -0,0 +1,132 @@
+"""Detection and targeted repair of missing hours in the usage statistics."""
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api import ContactEnergyApi
+from .const import DATA_IMPORTS, DOMAIN, GAP_MERGE_DAYS
+from .importer import ContactEnergyUsageImport
+from .statistics import StatisticIds
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def find_missing_hours(starts: Iterable[float]) -> list[int]:
+    """Return the epoch hours missing between the first and last stored row."""
+    hours = sorted({int(start) // 3600 for start in starts})
+    missing = []
+    for previous, current in zip(hours, hours[1:]):
+        missing.extend(range(previous + 1, current))
+    return missing
+
+
+def merge_into_ranges(hours: Iterable[int], merge_days: int = GAP_MERGE_DAYS) -> list[tuple[date, date]]:
+    """Merge missing hours into inclusive local date ranges.
+
+    Ranges with fewer than `merge_days` days between them are joined, since
+    downloading a day in between is cheaper than another request.
+    """
+    days = sorted({dt_util.as_local(dt_util.utc_from_timestamp(hour * 3600)).date() for hour in hours})
+    ranges: list[tuple[date, date]] = []
+    for day in days:
+        if ranges and (day - ranges[-1][1]).days <= merge_days:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def _row_start(row: dict) -> float:
+    """Return the start of a statistics row as a timestamp."""
+    start = row["start"]
+    return start.timestamp() if isinstance(start, datetime) else start
+
+
+class ContactEnergyGapRepair:
+    """Find holes in an ICP's hourly statistics and re-import only those days.
+
+    The scan covers the last `horizon_days` days, between the first and last
+    stored rows; hours after the last row are left to the regular update and
+    hours before the first to the backfill. Each merged range is re-imported
+    with ContactEnergyUsageImport. A day is only repaired once until the entry
+    is reloaded, so a day the provider itself is missing hours for is not
+    fetched again on every scan; a range whose import failed is tried again
+    on the next scan.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: ContactEnergyApi,
+        icp: str,
+        account_id: str,
+        contract_id: str,
+        ids: StatisticIds,
+        horizon_days: int,
+    ) -> None:
+        """Initialize the gap repair."""
+        self._hass = hass
+        self._api = api
+        self._icp = icp
+        self._account_id = account_id
+        self._contract_id = contract_id
+        self._ids = ids
+        self._horizon_days = horizon_days
+        self._attempted: set[date] = set()
+
+    async def async_scan(self) -> list[tuple[date, date]]:
+        """Return the date ranges holding missing hours, skipping days already repaired."""
+        start = dt_util.as_utc(dt_util.start_of_local_day() - timedelta(days=self._horizon_days))
+        stats = await get_instance(self._hass).async_add_executor_job(
+            statistics_during_period,
+            self._hass,
+            start,
+            None,
+            set(self._ids),
+            "hour",
+            None,
+            {"sum"},
+        )
+        missing: set[int] = set()
+        for rows in stats.values():
+            missing.update(find_missing_hours(_row_start(row) for row in rows))
+
+        ranges = merge_into_ranges(missing)
+        return [
+            (first, last)
+            for first, last in ranges
+            if any(first + timedelta(days=i) not in self._attempted for i in range((last - first).days + 1))
+        ]
+
+    async def async_run(self, _now: datetime | None = None) -> None:
+        """Scan for gaps and re-import them, one range at a time."""
+        imports = self._hass.data[DOMAIN].setdefault(DATA_IMPORTS, {})
+        if (running := imports.get(self._icp)) is not None and not running.done():
+            _LOGGER.debug("Usage import running for %s, skipping gap scan", self._icp)
+            return
+        # Registered like a service import so the two never overlap
+        imports[self._icp] = asyncio.current_task()
+
+        try:
+            ranges = await self.async_scan()
+        except Exception as error:
+            _LOGGER.error("Error scanning usage statistics of %s for gaps: %s", self._icp, error)
+            return
+        if not ranges:
+            _LOGGER.debug("No gaps in the usage statistics of %s", self._icp)
+            return
+
+        _LOGGER.info("Repairing %d gaps in the usage statistics of %s", len(ranges), self._icp)
+        for first, last in ranges:
+            if not await ContactEnergyUsageImport(
+                self._hass, self._api, self._icp, self._account_id, self._contract_id, first, last, self._ids
+            ).async_run():
+                continue
+            self._attempted.update(first + timedelta(days=i) for i in range((last - first).days + 1))
+
@@ -0,0 +1,211 @@
+"""On-demand usage import for a date range, streamed into the recorder."""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistic_during_period,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .api import ContactEnergyApi
+from .const import (
+    EVENT_IMPORT_PROGRESS,
+    IMPORT_BATCH_ROWS,
+    USAGE_INTERVAL_HOURLY,
+    USAGE_RANGE_MAX_DAYS,
+)
+from .ratelimit import PRIORITY_BACKGROUND
+from .statistics import StatisticIds, build_metadata, build_statistics
+from .usage import HourlyUsage
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+
+
+class ContactEnergyUsageImport:
+    """Re-import an ICP's usage between two dates.
+
+    The range is fetched a request-sized chunk at a time and each chunk is
+    written in batches of at most IMPORT_BATCH_ROWS rows per statistic,
+    waiting for the recorder to catch up between batches. Sums continue from
+    the row before the range, and rows after it are shifted by the change in
+    the range's total so the series stays continuous. Progress is fired as
+    EVENT_IMPORT_PROGRESS events.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: ContactEnergyApi,
+        icp: str,
+        account_id: str,
+        contract_id: str,
+        start: date,
+        end: date,
+        ids: StatisticIds,
+        interval: str = USAGE_INTERVAL_HOURLY,
+    ) -> None:
+        """Initialize the import."""
+        self._hass = hass
+        self._api = api
+        self._icp = icp
+        self._account_id = account_id
+        self._contract_id = contract_id
+        self._ids = ids
+        self._interval = interval
+        self.start = start
+        self.end = end
+        self.days = 0
+        self.rows = 0
+
+    async def async_run(self) -> bool:
+        """Run the import, firing a progress event after every chunk. Return whether it succeeded."""
+        self._async_fire(STATUS_RUNNING)
+        try:
+            await self._async_import()
+        except Exception as error:
+            _LOGGER.error("Usage import for %s failed: %s", self._icp, error)
+            self._async_fire(STATUS_FAILED, error=str(error))
+            return False
+        _LOGGER.info("Imported %d days of usage for %s", self.days, self._icp)
+        self._async_fire(STATUS_COMPLETE)
+        return True
+
+    async def _async_import(self) -> None:
+        """Fetch and write the range chunk by chunk."""
+        aggregated = self._interval != USAGE_INTERVAL_HOURLY
+        chunk_days = USAGE_RANGE_MAX_DAYS[self._interval]
+        range_start = dt_util.as_utc(dt_util.start_of_local_day(self.start))
+        sums = await self._async_get_sums_before(range_start)
+        if missing := [statistic_id for statistic_id in self._ids if statistic_id not in sums]:
+            _LOGGER.info(
+                "No usage stored for %s before %s, starting %s from 0", self._icp, self.start, ", ".join(missing)
+            )
+        sums = {statistic_id: sums.get(statistic_id, 0.0) for statistic_id in self._ids}
+        # The stored sums up to the last hour imported so far, before rewriting.
+        # Where the range has no stored rows they carry on from the row before
+        # it, so rows after a hole at the end of the range, or a series starting
+        # after the range, are still shifted onto the new total.
+        previous_sums = dict(sums)
+        last_start: datetime | None = None
+        currency = "NZD"
+
+        chunk_start = self.start
+        while chunk_start <= self.end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), self.end)
+            usage = await self._api.get_usage_range(
+                chunk_start,
+                chunk_end,
+                self._account_id,
+                self._contract_id,
+                self._interval,
+                PRIORITY_BACKGROUND,
+                raise_errors=True,
+            )
+            if not usage:
+                _LOGGER.debug("No usage available from %s, stopping import", chunk_start)
+                break
+
+            hourly = HourlyUsage.concat(
+                HourlyUsage.from_points(points, aggregated) for _, points in sorted(usage.items())
+            )
+            if not len(hourly):
+                break
+            currency = hourly.currency or currency
+            result = build_statistics(hourly, self._ids, sums)
+            sums = result.sums
+
+            last_start = hourly.start(len(hourly) - 1)
+            previous_sums.update(await self._async_get_sums(hourly.start(0), last_start + timedelta(hours=1)))
+            await self._async_write(result.statistics, currency)
+
+            self.days += len(usage)
+            self._async_fire(STATUS_RUNNING)
+            if chunk_end.isoformat() not in usage:
+                break
+            chunk_start = chunk_end + timedelta(days=1)
+
+        if last_start is None:
+            return
+
+        # Shift the rows after the range by however much its total changed
+        metadata = build_metadata(self._icp, currency, self._ids, self._interval)
+        for statistic_id in self._ids:
+            if adjustment := sums[statistic_id] - previous_sums[statistic_id]:
+                get_instance(self._hass).async_adjust_statistics(
+                    statistic_id,
+                    last_start + timedelta(hours=1),
+                    adjustment,
+                    metadata[statistic_id]["unit_of_measurement"],
+                )
+
+    async def _async_write(self, statistics: dict[str, list], currency: str) -> None:
+        """Write rows in bounded batches, letting the recorder drain in between."""
+        metadata = build_metadata(self._icp, currency, self._ids, self._interval)
+        recorder = get_instance(self._hass)
+        for statistic_id, rows in statistics.items():
+            for index in range(0, len(rows), IMPORT_BATCH_ROWS):
+                batch = rows[index:index + IMPORT_BATCH_ROWS]
+                async_add_external_statistics(self._hass, metadata[statistic_id], batch)
+                self.rows += len(batch)
+                await recorder.async_block_till_done()
+
+    async def _async_get_sums_before(self, start: datetime) -> dict[str, float]:
+        """Return the sum of the last row stored before start for each statistic that has one.
+
+        With no lower bound the change over the period is the newest sum
+        itself, which the recorder finds with a single indexed lookup.
+        """
+        recorder = get_instance(self._hass)
+        sums = {}
+        for statistic_id in self._ids:
+            result = await recorder.async_add_executor_job(
+                statistic_during_period, self._hass, None, start, statistic_id, {"change"}, None
+            )
+            if (change := result.get("change")) is not None:
+                sums[statistic_id] = change
+        return sums
+
+    async def _async_get_sums(self, start: datetime, end: datetime) -> dict[str, float]:
+        """Return the sum of the last stored row in [start, end) for each statistic that has one."""
+        stats = await get_instance(self._hass).async_add_executor_job(
+            statistics_during_period,
+            self._hass,
+            start,
+            end,
+            set(self._ids),
+            "hour",
+            None,
+            {"sum"},
+        )
+        return {
+            statistic_id: rows[-1]["sum"] or 0.0
+            for statistic_id, rows in stats.items()
+            if rows
+        }
+
+    @callback
+    def _async_fire(self, status: str, **extra: Any) -> None:
+        """Fire a progress event."""
+        self._hass.bus.async_fire(
+            EVENT_IMPORT_PROGRESS,
+            {
+                "icp": self._icp,
+                "interval": self._interval,
+                "start_date": self.start.isoformat(),
+                "end_date": self.end.isoformat(),
+                "status": status,
+                "days": self.days,
+                "days_total": (self.end - self.start).days + 1,
+                "rows": self.rows,
+                **extra,
+            },
+        )
@@ -0,0 +1,128 @@
+"""Performance instrumentation for the Contact Energy integration."""
+from bisect import bisect_left
+from collections import defaultdict, deque
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+UPDATE_DURATION_SAMPLES = 20
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one observation."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class ApiMetrics:
+    """Request, error, byte and cache counters for one API client."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.latency: defaultdict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.requests: defaultdict[str, int] = defaultdict(int)
+        self.errors: defaultdict[str, int] = defaultdict(int)
+        self.bytes_received = 0
+        self.cache_hits: defaultdict[str, int] = defaultdict(int)
+        self.cache_misses: defaultdict[str, int] = defaultdict(int)
+        self.coalesced: defaultdict[str, int] = defaultdict(int)
+        self.update_durations: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=UPDATE_DURATION_SAMPLES)
+        )
+        self._listeners: list[Callable[[], None]] = []
+
+    def record_request(self, endpoint: str, seconds: float, received: int = 0) -> None:
+        """Record a completed request attempt."""
+        self.requests[endpoint] += 1
+        self.latency[endpoint].record(seconds)
+        self.bytes_received += received
+
+    def record_error(self, endpoint: str, error: Exception) -> None:
+        """Record a failed request by exception class."""
+        self.errors[f"{endpoint}.{type(error).__name__}"] += 1
+
+    def record_cache(self, cache: str, hits: int = 0, misses: int = 0) -> None:
+        """Record cache hits and misses."""
+        self.cache_hits[cache] += hits
+        self.cache_misses[cache] += misses
+
+    def record_coalesced(self, endpoint: str) -> None:
+        """Record a call served by joining an identical in-flight request."""
+        self.coalesced[endpoint] += 1
+
+    def hit_ratio(self, cache: str) -> float | None:
+        """Return the hit ratio of a cache, as a percentage."""
+        total = self.cache_hits[cache] + self.cache_misses[cache]
+        if not total:
+            return None
+        return round(100 * self.cache_hits[cache] / total, 1)
+
+    @callback
+    def record_update(self, name: str, seconds: float) -> None:
+        """Record the duration of an update cycle and notify listeners."""
+        self.update_durations[name].append(seconds)
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for completed update cycles."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable snapshot."""
+        return {
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "bytes_received": self.bytes_received,
+            "coalesced": dict(self.coalesced),
+            "latency": {endpoint: histogram.as_dict() for endpoint, histogram in self.latency.items()},
+            "cache": {
+                cache: {
+                    "hits": self.cache_hits[cache],
+                    "misses": self.cache_misses[cache],
+                    "hit_ratio": self.hit_ratio(cache),
+                }
+                for cache in set(self.cache_hits) | set(self.cache_misses)
+            },
+            "update_durations": {
+                name: [round(seconds, 3) for seconds in durations]
+                for name, durations in self.update_durations.items()
+            },
+        }
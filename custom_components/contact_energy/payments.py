@@ -0,0 +1,108 @@
+"""Payment history for Contact Energy, imported as long-term statistics."""
+import logging
+from datetime import date, datetime
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, STATISTIC_PAYMENTS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def payments_statistic_id(icp: str) -> str:
+    """Return the statistic id of an ICP's payment history."""
+    return f"{DOMAIN}:{STATISTIC_PAYMENTS}_{icp.lower()}"
+
+
+def parse_payments(account_data: dict[str, Any]) -> dict[date, float]:
+    """Return the total paid per day from an /accounts/v2 payload.
+
+    Amounts look like "$1,234.56" and dates like "05 Jan 2024"; payments that
+    cannot be parsed are skipped.
+    """
+    totals: dict[date, float] = {}
+    for payment in account_data.get("accountDetail", {}).get("payments", []):
+        try:
+            amount = payment["amount"]
+            if isinstance(amount, str):
+                amount = amount.replace("$", "").replace(",", "")
+            day = datetime.strptime(payment["date"], "%d %b %Y").date()
+            totals[day] = totals.get(day, 0.0) + float(amount)
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.debug("Skipping payment %s: %s", payment, error)
+    return totals
+
+
+class ContactEnergyPaymentHistory:
+    """Import an account's payments, once, as a cumulative statistic series.
+
+    Each payment becomes a row at the start of its day, with the amount as the
+    state and the total paid so far as the sum. Only payments dated after the
+    last stored row are imported, so the series fills in incrementally as new
+    payments appear in the account payload.
+    """
+
+    def __init__(self, hass: HomeAssistant, icp: str, currency: str = "NZD") -> None:
+        """Initialize the payment history."""
+        self._hass = hass
+        self._icp = icp
+        self._currency = currency
+        self.statistic_id = payments_statistic_id(icp)
+        self._last: tuple[float, float] | None = None
+
+    async def async_import(self, account_data: dict[str, Any] | None) -> int:
+        """Import payments newer than the last stored one. Return the rows added."""
+        if not account_data:
+            return 0
+        payments = parse_payments(account_data)
+        if not payments:
+            return 0
+
+        if self._last is None:
+            self._last = await self._async_get_last()
+        last_start, total = self._last
+
+        statistics = []
+        for day in sorted(payments):
+            start = dt_util.as_utc(dt_util.start_of_local_day(day))
+            if start.timestamp() <= last_start:
+                continue
+            total += payments[day]
+            statistics.append(StatisticData(start=start, state=payments[day], sum=total))
+
+        if not statistics:
+            return 0
+
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Contact Energy - Payments ({self._icp})",
+            source=DOMAIN,
+            statistic_id=self.statistic_id,
+            unit_of_measurement=self._currency,
+        )
+        async_add_external_statistics(self._hass, metadata, statistics)
+        self._last = (statistics[-1]["start"].timestamp(), total)
+        _LOGGER.debug("Imported %d payments for %s", len(statistics), self._icp)
+        return len(statistics)
+
+    async def _async_get_last(self) -> tuple[float, float]:
+        """Return the start timestamp and sum of the last stored payment row."""
+        result = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, self.statistic_id, True, {"sum"}
+        )
+        if not result or not result.get(self.statistic_id):
+            return float("-inf"), 0.0
+        row = result[self.statistic_id][0]
+        start = row["start"]
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        return start, row["sum"] or 0.0
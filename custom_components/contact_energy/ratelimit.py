@@ -0,0 +1,136 @@
+"""Instance-wide request rate limiting for the Contact Energy API."""
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_REQUESTS_PER_MINUTE,
+    DATA_RATE_LIMITER,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DOMAIN,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PRIORITY_RESERVE,
+)
+
+# Request priorities; lower values are served first.
+PRIORITY_NORMAL = 0
+PRIORITY_BACKGROUND = 1
+
+
+class TokenBucketLimiter:
+    """Token bucket shared by every API client of a Home Assistant instance.
+
+    Tokens refill at `rate` per second up to `burst`. Waiting requests are
+    served in priority order, then first come first served, so scheduled
+    refreshes overtake queued backfill and import requests. Background
+    requests also leave `reserve` tokens in the bucket, so a steady-state
+    refresh arriving after a busy backfill still gets its burst.
+    """
+
+    def __init__(self, rate: float, burst: int, reserve: int = 0) -> None:
+        """Initialize the limiter."""
+        self.rate = rate
+        self.burst = burst
+        self.reserve = min(reserve, burst - 1)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    async def async_acquire(self, priority: int = PRIORITY_NORMAL) -> None:
+        """Wait until a request of the given priority may be sent."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._async_dispatch()
+        if future.done():
+            return
+
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before being cancelled; hand the token back
+                self._tokens += 1
+                self._async_dispatch()
+            raise
+        self.waits += 1
+        self.wait_seconds += time.monotonic() - started
+
+    def _needed(self, priority: int) -> float:
+        """Return the tokens that must be available to send at a priority."""
+        return 1 + (self.reserve if priority >= PRIORITY_BACKGROUND else 0)
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Release waiters in priority order while tokens last."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < self._needed(priority):
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            future.set_result(None)
+        self._async_schedule()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Wake up when the first waiter can be served."""
+        if self._timer is not None or not self._waiters:
+            return
+        priority = self._waiters[0][0]
+        delay = max(0.0, (self._needed(priority) - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._async_dispatch)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        return {
+            "requests_per_minute": round(self.rate * 60, 1),
+            "burst": self.burst,
+            "waiting": len(self._waiters),
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 1),
+        }
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant) -> TokenBucketLimiter:
+    """Return the limiter shared by all entries, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (limiter := domain_data.get(DATA_RATE_LIMITER)) is None:
+        limiter = TokenBucketLimiter(
+            DEFAULT_REQUESTS_PER_MINUTE / 60, RATE_LIMIT_BURST, RATE_LIMIT_PRIORITY_RESERVE
+        )
+        domain_data[DATA_RATE_LIMITER] = limiter
+    return limiter
+
+
+@callback
+def async_update_rate_limit(hass: HomeAssistant) -> None:
+    """Apply the lowest request rate configured by any entry, at least one a minute."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    limit = min(
+        (entry.data.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE) for entry in entries),
+        default=DEFAULT_REQUESTS_PER_MINUTE,
+    )
+    async_get_rate_limiter(hass).rate = max(limit, 1) / 60
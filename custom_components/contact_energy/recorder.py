@@ -0,0 +1,10 @@
+"""Recorder platform for Contact Energy."""
+from homeassistant.core import HomeAssistant, callback
+
+from .const import ATTR_ETA, ATTR_LAST_UPDATED
+
+
+@callback
+def exclude_attributes(hass: HomeAssistant) -> set[str]:
+    """Exclude volatile attributes from being recorded in the database."""
+    return {ATTR_ETA, ATTR_LAST_UPDATED}
@@ -0,0 +1,118 @@
+"""Adaptive usage polling for Contact Energy."""
+import logging
+from collections import deque
+from datetime import date, datetime, timedelta
+from statistics import median
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    POLL_DEFAULT_LAG,
+    POLL_FAST_INTERVAL,
+    POLL_LAG_SAMPLES,
+    POLL_MIN_WINDOW,
+    POLL_RETRY_INTERVAL,
+    POLL_SAVE_DELAY,
+    POLL_SLOW_INTERVAL,
+    POLL_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def schedule_store(hass: HomeAssistant, icp: str) -> Store:
+    """Return the store holding an ICP's learned polling schedule."""
+    return Store(hass, POLL_STORAGE_VERSION, f"{DOMAIN}.schedule_{icp}")
+
+
+class UsagePollScheduler:
+    """Decide when to poll for usage, based on when new days actually arrive.
+
+    Contact Energy publishes each day's usage once, a couple of days late. The
+    scheduler tracks the newest day with data and how long after the end of a
+    day it became available (the lag). It polls every POLL_FAST_INTERVAL
+    around the expected arrival of the next day, sleeps until then otherwise,
+    and falls back to POLL_SLOW_INTERVAL when a day is overdue.
+    """
+
+    def __init__(self, hass: HomeAssistant, icp: str) -> None:
+        """Initialize the scheduler."""
+        self._store = schedule_store(hass, icp)
+        self._lags: deque[float] = deque(maxlen=POLL_LAG_SAMPLES)
+        self.latest_day: date | None = None
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Restore the learned schedule, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if data := await self._store.async_load():
+            self._lags.extend(data.get("lags", []))
+            if data.get("latest_day"):
+                self.latest_day = date.fromisoformat(data["latest_day"])
+
+    @property
+    def expected_lag(self) -> timedelta:
+        """Return the typical delay between the end of a day and its data arriving."""
+        if not self._lags:
+            return POLL_DEFAULT_LAG
+        return timedelta(hours=median(self._lags))
+
+    @property
+    def window(self) -> timedelta:
+        """Return half the width of the polling window around the expected arrival."""
+        if len(self._lags) < 2:
+            return POLL_DEFAULT_LAG / 8
+        spread = timedelta(hours=(max(self._lags) - min(self._lags)) / 2)
+        return max(POLL_MIN_WINDOW, spread)
+
+    def expected_arrival(self) -> datetime | None:
+        """Return when the day after the latest known day should become available."""
+        if self.latest_day is None:
+            return None
+        # The next day ends at the start of the day after it
+        return dt_util.start_of_local_day(self.latest_day + timedelta(days=2)) + self.expected_lag
+
+    def record_poll(self, latest_day: date | None) -> None:
+        """Record the newest day with data seen by a successful poll."""
+        if latest_day is None or (self.latest_day is not None and latest_day <= self.latest_day):
+            return
+
+        if self.latest_day is not None:
+            day_end = dt_util.start_of_local_day(latest_day + timedelta(days=1))
+            lag = (dt_util.now() - day_end).total_seconds() / 3600
+            if lag > 0:
+                self._lags.append(lag)
+                _LOGGER.debug("Usage for %s arrived %.1f hours after the end of the day", latest_day, lag)
+
+        self.latest_day = latest_day
+        self._store.async_delay_save(self._data_to_save, POLL_SAVE_DELAY)
+
+    def next_poll(self, failed: bool = False) -> datetime:
+        """Return the next time usage should be polled."""
+        now = dt_util.utcnow()
+        if failed:
+            return now + POLL_RETRY_INTERVAL
+
+        arrival = self.expected_arrival()
+        if arrival is None:
+            return now + POLL_FAST_INTERVAL
+
+        window = self.window
+        if now < arrival - window:
+            return dt_util.as_utc(arrival - window)
+        if now <= arrival + window:
+            return now + POLL_FAST_INTERVAL
+        return now + POLL_SLOW_INTERVAL
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "lags": list(self._lags),
+            "latest_day": self.latest_day.isoformat() if self.latest_day else None,
+        }
@@ -1,30 +1,47 @@
 """Contact Energy sensors."""
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorStateClass,
 )
 from custom_components.contact_energy.sensors import (
     ContactEnergyAccountSensor,
-    ContactEnergyUsageSensor
+    ContactEnergyUsageSensor,
+    ContactEnergyBackfillSensor,
+    ContactEnergyMetricSensor
 )
-from custom_components.contact_energy.api import ContactEnergyApi
+from custom_components.contact_energy.backfill import ContactEnergyBackfill
+from custom_components.contact_energy.coordinator import ContactEnergyAccountCoordinator
+from custom_components.contact_energy.gaps import ContactEnergyGapRepair
+from custom_components.contact_energy.payments import ContactEnergyPaymentHistory
+from custom_components.contact_energy.scheduler import UsagePollScheduler
+from custom_components.contact_energy.statistics import statistic_ids
+from custom_components.contact_energy.usage_cache import ContactEnergyUsageCache
 
 from homeassistant.const import (
     CURRENCY_DOLLAR,
-    CONF_EMAIL,
-    CONF_PASSWORD,
-    UnitOfEnergy
+    PERCENTAGE,
+    UnitOfEnergy,
+    UnitOfTime
 )
 
 from custom_components.contact_energy.const import (
+    DOMAIN,
     CONF_USAGE_DAYS, 
+    CONF_INCREMENTAL_IMPORT,
+    CONF_BACKFILL_START,
+    CONF_BACKFILL_INTERVAL,
+    CONF_GAP_SCAN_DAYS,
     CONF_ACCOUNT_ID, 
     CONF_CONTRACT_ID, 
     CONF_CONTRACT_ICP,
+    CONF_CONTRACTS,
+    CONF_LEGACY_STATISTICS,
     SENSOR_USAGE_NAME,
     SENSOR_ACCOUNT_BALANCE_NAME,
     SENSOR_NEXT_BILL_AMOUNT_NAME,
@@ -32,45 +49,145 @@ from custom_components.contact_energy.const import (
     SENSOR_PAYMENT_DUE_NAME,
     SENSOR_PAYMENT_DUE_DATE_NAME,
     SENSOR_PREVIOUS_READING_DATE_NAME,
-    SENSOR_NEXT_READING_DATE_NAME
+    SENSOR_NEXT_READING_DATE_NAME,
+    SENSOR_BACKFILL_NAME,
+    SENSOR_API_REQUESTS_NAME,
+    SENSOR_USAGE_UPDATE_DURATION_NAME,
+    SENSOR_CACHE_HIT_RATIO_NAME,
+    STARTUP_TIME_BUDGET,
+    DEFAULT_GAP_SCAN_DAYS,
+    GAP_SCAN_DELAY,
+    GAP_SCAN_INTERVAL,
+    USAGE_INTERVAL_HOURLY
 )
 
 _LOGGER = logging.getLogger(__name__)
-SCAN_INTERVAL = timedelta(hours=8)
+
+
+def _contract_device(data: dict, contract_id: str) -> dict:
+    """Return the meter of a contract in the /accounts/v2 payload."""
+    contract = next(
+        contract for contract in data["accountDetail"]["contracts"] if contract["id"] == contract_id
+    )
+    return contract["devices"][0]
+
+
+def _contract_sensors(hass, api, coordinator, contract, account_id, usage_days, incremental):
+    """Return the usage and meter reading sensors of one contract."""
+    contract_id = contract[CONF_CONTRACT_ID]
+    icp = contract[CONF_CONTRACT_ICP]
+
+    usage_sensor = ContactEnergyUsageSensor(
+        hass,
+        SENSOR_USAGE_NAME,
+        api,
+        icp,
+        UnitOfEnergy.KILO_WATT_HOUR,
+        "mdi:meter-electric",
+        SensorStateClass.TOTAL,
+        SensorDeviceClass.ENERGY,
+        usage_days,
+        incremental,
+        ContactEnergyUsageCache(hass, icp),
+        account_id,
+        contract_id,
+        UsagePollScheduler(hass, icp),
+        statistic_ids(icp, contract.get(CONF_LEGACY_STATISTICS, False))
+    )
+
+    reading_sensors = [
+        ContactEnergyAccountSensor(
+            hass,
+            SENSOR_PREVIOUS_READING_DATE_NAME,
+            coordinator,
+            icp,
+            None,
+            "mdi:calendar",
+            None,
+            SensorDeviceClass.DATE,
+            lambda data: datetime.strptime(
+                _contract_device(data, contract_id)["registers"][0]["previousMeterReadingDate"],
+                "%d %b %Y"
+            ).date().isoformat(),
+        ),
+        ContactEnergyAccountSensor(
+            hass,
+            SENSOR_NEXT_READING_DATE_NAME,
+            coordinator,
+            icp,
+            None,
+            "mdi:calendar",
+            None,
+            SensorDeviceClass.DATE,
+            lambda data: datetime.strptime(
+                _contract_device(data, contract_id)["nextMeterReadDate"],
+                "%d %b %Y"
+            ).date().isoformat(),
+        ),
+    ]
+
+    duration_sensor = ContactEnergyMetricSensor(
+        hass,
+        SENSOR_USAGE_UPDATE_DURATION_NAME,
+        api,
+        icp,
+        UnitOfTime.SECONDS,
+        "mdi:timer-outline",
+        SensorStateClass.MEASUREMENT,
+        lambda metrics: (
+            round(metrics.update_durations[f"usage_{icp}"][-1], 2)
+            if metrics.update_durations[f"usage_{icp}"] else None
+        ),
+    )
+
+    return usage_sensor, reading_sensors, duration_sensor
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     """Set up Contact Energy sensors from a config entry."""
-    email = entry.data[CONF_EMAIL]
-    password = entry.data[CONF_PASSWORD]
     account_id = entry.data[CONF_ACCOUNT_ID]
-    contract_id = entry.data[CONF_CONTRACT_ID]
+    contracts = entry.data[CONF_CONTRACTS]
     usage_days = entry.data.get(CONF_USAGE_DAYS, 10)
-    icp = entry.data[CONF_CONTRACT_ICP]
-
-    api = ContactEnergyApi(hass, email, password, account_id, contract_id)
-    
-    # Initialize API connection
-    if not await api.async_login():
-        _LOGGER.error("Failed to connect to Contact Energy API")
-        return False
-
-    sensors = [
-        ContactEnergyUsageSensor(
-            hass, 
-            SENSOR_USAGE_NAME, 
-            api, 
-            icp, 
-            UnitOfEnergy.KILO_WATT_HOUR,
-            "mdi:meter-electric",
-            SensorStateClass.TOTAL,
-            SensorDeviceClass.ENERGY,
-            usage_days
-        ),
+    incremental = entry.data.get(CONF_INCREMENTAL_IMPORT, True)
+    backfill_start = entry.data.get(CONF_BACKFILL_START)
+    backfill_interval = entry.data.get(CONF_BACKFILL_INTERVAL, USAGE_INTERVAL_HOURLY)
+    gap_scan_days = entry.data.get(CONF_GAP_SCAN_DAYS, DEFAULT_GAP_SCAN_DAYS)
+    # Account-wide sensors belong to the first contract's device
+    icp = contracts[0][CONF_CONTRACT_ICP]
+
+    # Shared client for this login, set up in __init__.async_setup_entry
+    api = hass.data[DOMAIN][entry.entry_id]
+
+    # One accounts call per cycle serves every contract of the login
+    coordinator = ContactEnergyAccountCoordinator(hass, api, account_id)
+    # Refreshes return the cached payload at once; the fresh one follows here
+    entry.async_on_unload(api.async_add_account_listener(coordinator.async_handle_refreshed_accounts))
+    # The first refresh only holds up setup for the startup budget; account
+    # sensors show their restored state until it completes in the background.
+    first_refresh = entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN}_account_first_refresh"
+    )
+    done, _ = await asyncio.wait({first_refresh}, timeout=STARTUP_TIME_BUDGET.total_seconds())
+    if not done:
+        _LOGGER.info("Account refresh is taking longer than %s, continuing in the background", STARTUP_TIME_BUDGET)
+
+    # Payment history is imported once per login as a statistic series on the
+    # first contract's ICP, and topped up after every account refresh.
+    payments = ContactEnergyPaymentHistory(hass, icp)
+
+    @callback
+    def _async_import_payments() -> None:
+        if coordinator.last_update_success:
+            hass.async_create_task(payments.async_import(coordinator.data))
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_import_payments))
+    _async_import_payments()
+
+    account_sensors = [
         ContactEnergyAccountSensor(
             hass,
             SENSOR_ACCOUNT_BALANCE_NAME,
-            api,
+            coordinator,
             icp,
             CURRENCY_DOLLAR,
             "mdi:cash",
@@ -81,7 +198,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         ContactEnergyAccountSensor(
             hass,
             SENSOR_NEXT_BILL_AMOUNT_NAME,
-            api,
+            coordinator,
             icp,
             CURRENCY_DOLLAR,
             "mdi:cash-clock",
@@ -92,7 +209,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         ContactEnergyAccountSensor(
             hass,
             SENSOR_NEXT_BILL_DATE_NAME,
-            api,
+            coordinator,
             icp,
             None,
             "mdi:calendar",
@@ -106,7 +223,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         ContactEnergyAccountSensor(
             hass,
             SENSOR_PAYMENT_DUE_NAME,
-            api,
+            coordinator,
             icp,
             CURRENCY_DOLLAR,
             "mdi:cash-marker",
@@ -117,7 +234,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         ContactEnergyAccountSensor(
             hass,
             SENSOR_PAYMENT_DUE_DATE_NAME,
-            api,
+            coordinator,
             icp,
             None,
             "mdi:calendar-clock",
@@ -128,34 +245,104 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
                 "%d %b %Y"
             ).date().isoformat(),
         ),
-        ContactEnergyAccountSensor(
+    ]
+    usage_sensors = []
+    duration_sensors = []
+    for contract in contracts:
+        usage_sensor, reading_sensors, duration_sensor = _contract_sensors(
+            hass, api, coordinator, contract, account_id, usage_days, incremental
+        )
+        usage_sensors.append(usage_sensor)
+        account_sensors.extend(reading_sensors)
+        duration_sensors.append(duration_sensor)
+
+    # Entities are added straight away with their restored state. Usage
+    # sensors start their first update in the background once Home Assistant
+    # has started, concurrently, sharing the client's session, token and
+    # request limit.
+    async_add_entities(account_sensors)
+    async_add_entities(usage_sensors)
+
+    # Optional diagnostic sensors for API performance, disabled by default
+    async_add_entities([
+        ContactEnergyMetricSensor(
             hass,
-            SENSOR_PREVIOUS_READING_DATE_NAME,
+            SENSOR_API_REQUESTS_NAME,
             api,
             icp,
             None,
-            "mdi:calendar",
-            None,
-            SensorDeviceClass.DATE,
-            lambda data: datetime.strptime(
-                data["accountDetail"]["contracts"][0]["devices"][0]["registers"][0]["previousMeterReadingDate"],
-                "%d %b %Y"
-            ).date().isoformat(),
+            "mdi:counter",
+            SensorStateClass.TOTAL_INCREASING,
+            lambda metrics: sum(metrics.requests.values()),
+            lambda metrics: {
+                "requests": dict(metrics.requests),
+                "errors": dict(metrics.errors),
+                "bytes_received": metrics.bytes_received,
+                "mean_latency": {
+                    endpoint: round(histogram.mean, 3)
+                    for endpoint, histogram in metrics.latency.items()
+                    if histogram.count
+                },
+            },
         ),
-        ContactEnergyAccountSensor(
+        ContactEnergyMetricSensor(
             hass,
-            SENSOR_NEXT_READING_DATE_NAME,
+            SENSOR_CACHE_HIT_RATIO_NAME,
             api,
             icp,
-            None,
-            "mdi:calendar",
-            None,
-            SensorDeviceClass.DATE,
-            lambda data: datetime.strptime(
-                data["accountDetail"]["contracts"][0]["devices"][0]["nextMeterReadDate"],
-                "%d %b %Y"
-            ).date().isoformat(),
+            PERCENTAGE,
+            "mdi:database-check",
+            SensorStateClass.MEASUREMENT,
+            lambda metrics: metrics.hit_ratio("usage"),
+            lambda metrics: {"accounts_hit_ratio": metrics.hit_ratio("accounts")},
         ),
-    ]
-    async_add_entities(sensors, True)
-    return True
\ No newline at end of file
+        *duration_sensors,
+    ])
+
+    # Holes in recent statistics are looked for shortly after setup, then daily
+    if gap_scan_days:
+        for contract in contracts:
+            contract_icp = contract[CONF_CONTRACT_ICP]
+            repair = ContactEnergyGapRepair(
+                hass,
+                api,
+                contract_icp,
+                account_id,
+                contract[CONF_CONTRACT_ID],
+                statistic_ids(contract_icp, contract.get(CONF_LEGACY_STATISTICS, False)),
+                gap_scan_days,
+            )
+
+            @callback
+            def _async_start_repair(_now, repair=repair, contract_icp=contract_icp) -> None:
+                entry.async_create_background_task(
+                    hass, repair.async_run(), f"{DOMAIN}_gap_repair_{contract_icp}"
+                )
+
+            entry.async_on_unload(async_call_later(hass, GAP_SCAN_DELAY, _async_start_repair))
+            entry.async_on_unload(async_track_time_interval(hass, _async_start_repair, GAP_SCAN_INTERVAL))
+
+    if backfill_start:
+        if not incremental:
+            _LOGGER.warning("Usage backfill requires incremental import, not starting backfill")
+            return True
+
+        for contract in contracts:
+            contract_icp = contract[CONF_CONTRACT_ICP]
+            backfill = ContactEnergyBackfill(
+                hass,
+                api,
+                contract_icp,
+                account_id,
+                contract[CONF_CONTRACT_ID],
+                date.fromisoformat(backfill_start),
+                statistic_ids(contract_icp, contract.get(CONF_LEGACY_STATISTICS, False)),
+                backfill_interval,
+            )
+            async_add_entities([
+                ContactEnergyBackfillSensor(hass, SENSOR_BACKFILL_NAME, backfill, contract_icp, "mdi:history")
+            ])
+            entry.async_create_background_task(
+                hass, backfill.async_run(), f"{DOMAIN}_backfill_{contract_icp}"
+            )
+    return True
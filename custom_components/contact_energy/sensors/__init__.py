@@ -1,7 +1,11 @@
 from custom_components.contact_energy.sensors.account_sensor import ContactEnergyAccountSensor
 from custom_components.contact_energy.sensors.usage_sensor import ContactEnergyUsageSensor
+from custom_components.contact_energy.sensors.backfill_sensor import ContactEnergyBackfillSensor
+from custom_components.contact_energy.sensors.metric_sensor import ContactEnergyMetricSensor
 
 __all__ = [
     "ContactEnergyAccountSensor", 
-    "ContactEnergyUsageSensor"
+    "ContactEnergyUsageSensor",
+    "ContactEnergyBackfillSensor",
+    "ContactEnergyMetricSensor"
 ]
\ No newline at end of file
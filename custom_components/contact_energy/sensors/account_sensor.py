@@ -1,62 +1,76 @@
 """Contact Energy Account Sensor."""
 import logging
+from collections.abc import Callable
 from datetime import datetime
-from typing import Callable, Optional, Dict, Any
+from typing import Any
 
+from custom_components.contact_energy.const import ATTR_LAST_UPDATED
 from custom_components.contact_energy.sensors.base_sensor import BaseSensor
-from custom_components.contact_energy.api import InvalidAuth
-from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.core import callback
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class ContactEnergyAccountSensor(BaseSensor):
+class ContactEnergyAccountSensor(CoordinatorEntity, BaseSensor, RestoreEntity):
     """Sensor to track Contact Energy account details."""
 
     def __init__(
         self,
         hass,
         name: str,
-        api,
+        coordinator,
         icp: str,
         unit: str,
         icon: str,
-        state_class: Optional[str] = None,
-        device_class: Optional[str] = None,
-        value_fn: Callable[[Dict[str, Any]], Any] = lambda _: None,
+        state_class: str | None = None,
+        device_class: str | None = None,
+        value_fn: Callable[[dict[str, Any]], Any] = lambda _: None,
     ):
         """Initialize the sensor."""
-        super().__init__(hass, name, api, icp, unit, icon, state_class, device_class)
+        CoordinatorEntity.__init__(self, coordinator)
+        BaseSensor.__init__(self, hass, name, coordinator.api, icp, unit, icon, state_class, device_class)
         self._value_fn = value_fn
         self._state = None
+        self._written_available = True
 
-    async def async_update(self):
-        """Fetch new data and update the sensor state."""
+    async def async_added_to_hass(self) -> None:
+        """Populate the initial state from the coordinator, or the last state until it has data."""
+        await super().async_added_to_hass()
+        if self._update_from_data(self.coordinator.data):
+            return
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._state = last_state.state
+            if ATTR_LAST_UPDATED in last_state.attributes:
+                self._attributes = {ATTR_LAST_UPDATED: last_state.attributes[ATTR_LAST_UPDATED]}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated account data, writing state only when something changed."""
+        changed = self._update_from_data(self.coordinator.data)
+        if changed or self.available != self._written_available:
+            self._written_available = self.available
+            self.async_write_ha_state()
+
+    def _update_from_data(self, account_data: dict[str, Any] | None) -> bool:
+        """Extract the sensor state from the shared account payload.
+
+        Return whether the state changed.
+        """
+        if not account_data:
+            return False
         try:
-            account_data = await self._fetch_account_data()
-            self._state = self._value_fn(account_data)
-            self._update_attributes(account_data)
-        except InvalidAuth:
-            _LOGGER.warning("Authentication error updating %s, will retry on next update", self._name)
+            state = self._value_fn(account_data)
         except Exception as error:
             _LOGGER.error("Unexpected error updating account sensor %s: %s", self._name, error)
+            return False
 
-    async def _fetch_account_data(self) -> Dict[str, Any]:
-        """Fetch account details from API."""
-        return await self._api.async_get_accounts() or {}
+        if state == self._state:
+            return False
 
-    def _update_attributes(self, account_data: Dict[str, Any]):
-        """Update sensor attributes."""
+        # last_updated is when the value last changed; it is not recorded
+        self._state = state
         self._last_update = datetime.now()
-        self._attributes["last_updated"] = self._last_update.isoformat()
-
-        if self._device_class == SensorDeviceClass.MONETARY:
-            self._attributes["recent_payments"] = self._extract_recent_payments(account_data)
-
-    @staticmethod
-    def _extract_recent_payments(account_data: Dict[str, Any]) -> list:
-        """Extract recent payment history."""
-        return [
-            {"amount": payment["amount"], "date": payment["date"]}
-            for payment in account_data.get("accountDetail", {}).get("payments", [])
-        ]
+        self._attributes = {ATTR_LAST_UPDATED: self._last_update.isoformat()}
+        return True
@@ -0,0 +1,42 @@
+"""Contact Energy Backfill Progress Sensor."""
+from homeassistant.const import PERCENTAGE, EntityCategory
+from homeassistant.core import callback
+
+from custom_components.contact_energy.const import ATTR_ETA
+from custom_components.contact_energy.sensors.base_sensor import BaseSensor
+
+
+class ContactEnergyBackfillSensor(BaseSensor):
+    """Diagnostic sensor reporting the progress of the usage backfill."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(self, hass, name, backfill, icp, icon):
+        """Initialize the sensor."""
+        super().__init__(hass, name, None, icp, PERCENTAGE, icon)
+        self._backfill = backfill
+        self._state = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to backfill progress."""
+        self.async_on_remove(self._backfill.async_add_listener(self._handle_progress))
+        self._update_from_backfill()
+
+    @callback
+    def _handle_progress(self) -> None:
+        """Handle a progress update from the backfill job."""
+        self._update_from_backfill()
+        self.async_write_ha_state()
+
+    def _update_from_backfill(self) -> None:
+        """Copy the backfill job's progress into state and attributes."""
+        backfill = self._backfill
+        eta = backfill.eta
+        self._state = backfill.progress
+        self._attributes = {
+            "status": backfill.status,
+            "target_date": backfill.target.isoformat(),
+            "next_day_to_import": backfill.next_end.isoformat() if backfill.next_end else None,
+            ATTR_ETA: eta.isoformat() if eta else None,
+        }
@@ -1,5 +1,5 @@
 """Contact Energy Account Sensor."""
-from datetime import datetime, timedelta
+from datetime import datetime
 from homeassistant.helpers.entity import generate_entity_id
 from custom_components.contact_energy.api import InvalidAuth
 from homeassistant.util import slugify
@@ -9,8 +9,6 @@ from custom_components.contact_energy.const import (
     DOMAIN_NAME
 )
 
-SCAN_INTERVAL = timedelta(hours=8)
-FORCED_SCAN_INTERVAL = timedelta(hours=24)
 ENTITY_ID_FORMAT = DOMAIN + ".{}"
 
 class BaseSensor(SensorEntity):
@@ -39,9 +37,6 @@ class BaseSensor(SensorEntity):
         self._device_class = device_class
         self._last_update = None
         self._attributes = {}
-        self._update_failures = 0
-        self._update_interval = SCAN_INTERVAL
-        self._force_update_interval = FORCED_SCAN_INTERVAL
 
 
     @property
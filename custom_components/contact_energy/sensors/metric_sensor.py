@@ -0,0 +1,54 @@
+"""Contact Energy API Metric Sensor."""
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+
+from custom_components.contact_energy.sensors.base_sensor import BaseSensor
+
+
+class ContactEnergyMetricSensor(BaseSensor):
+    """Diagnostic sensor exposing one of the API client's performance metrics.
+
+    Disabled by default; refreshed at the end of every usage update cycle.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass,
+        name: str,
+        api,
+        icp: str,
+        unit: str,
+        icon: str,
+        state_class=None,
+        value_fn: Callable[[Any], Any] = lambda _: None,
+        attributes_fn: Callable[[Any], dict[str, Any]] = lambda _: {},
+    ):
+        """Initialize the sensor."""
+        super().__init__(hass, name, api, icp, unit, icon, state_class)
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+        self._state = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to metric updates."""
+        self.async_on_remove(self._api.metrics.async_add_listener(self._handle_metrics_update))
+        self._update_from_metrics()
+
+    @callback
+    def _handle_metrics_update(self) -> None:
+        """Handle the end of an update cycle."""
+        self._update_from_metrics()
+        self.async_write_ha_state()
+
+    def _update_from_metrics(self) -> None:
+        """Read the current value from the metrics."""
+        metrics = self._api.metrics
+        self._state = self._value_fn(metrics)
+        self._attributes = self._attributes_fn(metrics)
@@ -1,15 +1,33 @@
 """Contact Energy Usage Sensor."""
 import logging
-from datetime import datetime, timedelta
-from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
-from homeassistant.components.recorder.statistics import async_add_external_statistics
-from custom_components.contact_energy.sensors.base_sensor import BaseSensor
-from homeassistant.const import UnitOfEnergy
+import time
+from contextlib import suppress
+from datetime import date, datetime, timedelta
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from custom_components.contact_energy.api import RequestRejected, UnknownError
 from custom_components.contact_energy.const import DOMAIN
+from custom_components.contact_energy.sensors.base_sensor import BaseSensor
+from custom_components.contact_energy.statistics import (
+    build_metadata,
+    build_statistics,
+    statistic_ids
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
+from custom_components.contact_energy.usage import HourlyUsage
 
 _LOGGER = logging.getLogger(__name__)
+FORCED_SCAN_INTERVAL = timedelta(hours=24)
 
-class ContactEnergyUsageSensor(BaseSensor):
+class ContactEnergyUsageSensor(BaseSensor, RestoreEntity):
     """Define Contact Energy Usage sensor."""
 
     def __init__(        
@@ -22,7 +40,13 @@ class ContactEnergyUsageSensor(BaseSensor):
         icon, 
         state_class=None,
         device_class=None, 
-        usage_days=10
+        usage_days=10,
+        incremental=True,
+        cache=None,
+        account_id=None,
+        contract_id=None,
+        scheduler=None,
+        ids=None
     ):
         """Initialize the sensor."""
 
@@ -39,10 +63,79 @@ class ContactEnergyUsageSensor(BaseSensor):
 
         self._state = 0
         self._usage_days = usage_days
+        self._incremental = incremental
+        self._cache = cache
+        self._account_id = account_id
+        self._contract_id = contract_id
+        self._scheduler = scheduler
+        self._ids = ids or statistic_ids(icp)
+        self._unsub_poll = None
+        self._first_update = None
+        self._latest_day = None
+        self._update_failures = 0
+        self._force_update_interval = FORCED_SCAN_INTERVAL
+
+    @property
+    def should_poll(self):
+        """Polling is driven by the adaptive scheduler when there is one."""
+        return self._scheduler is None
 
+    async def async_added_to_hass(self):
+        """Restore the last state and start the first update once Home Assistant has started."""
+        if (last_state := await self.async_get_last_state()) is not None:
+            with suppress(ValueError):
+                self._state = float(last_state.state)
+        self.async_on_remove(async_at_started(self.hass, self._async_start_first_update))
+
+    async def async_will_remove_from_hass(self):
+        """Stop the first update and the adaptive polling schedule."""
+        if self._first_update and not self._first_update.done():
+            self._first_update.cancel()
+        if self._unsub_poll:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    @callback
+    def _async_start_first_update(self, _hass: HomeAssistant) -> None:
+        """Run the first update in the background; it schedules the ones after it."""
+        self._first_update = self.hass.async_create_background_task(
+            self.async_update_ha_state(True), f"{DOMAIN}_usage_first_update_{self._icp}"
+        )
+
+    @callback
+    def _schedule_next_update(self, failed=False):
+        """Schedule the next update at the time the scheduler picks."""
+        if self._unsub_poll:
+            self._unsub_poll()
+        next_poll = self._scheduler.next_poll(failed)
+        _LOGGER.debug("Next usage poll at %s", next_poll.isoformat())
+        self._unsub_poll = async_track_point_in_utc_time(
+            self.hass, self._async_scheduled_update, next_poll
+        )
+
+    async def _async_scheduled_update(self, _now):
+        """Run a scheduled update."""
+        self._unsub_poll = None
+        await self.async_update_ha_state(True)
 
     async def async_update(self):
         """Update the sensor."""
+        self._latest_day = None
+        if self._scheduler is not None:
+            await self._scheduler.async_load()
+
+        started = time.monotonic()
+        success = await self._async_update_usage()
+        self._api.metrics.record_update(f"usage_{self._icp}", time.monotonic() - started)
+
+        if self._scheduler is not None:
+            if success:
+                self._scheduler.record_poll(self._latest_day)
+            self._schedule_next_update(failed=not success)
+        return success
+
+    async def _async_update_usage(self):
+        """Fetch usage and import it into the recorder."""
         now = datetime.now()
         
         # Check if we need to force an update
@@ -69,101 +162,97 @@ class ContactEnergyUsageSensor(BaseSensor):
             today = now.replace(hour=0, minute=0, second=0, microsecond=0)
             _LOGGER.debug("Fetching usage data")
 
-            kWhStatistics = []
-            kWhRunningSum = 0
-            dollarStatistics = []
-            dollarRunningSum = 0
+            start_date = today - timedelta(days=self._usage_days)
+            end_date = today - timedelta(days=1)
 
-            freeKWhStatistics = []
-            freeKWhRunningSum = 0
+            # In incremental mode continue each series from the recorder's last
+            # stored sum and only import hours after it.
+            sums = None
+            imported_until = None
+            if self._incremental:
+                last_stats = await self._async_get_last_statistics()
+                sums = {statistic_id: last_sum for statistic_id, (_, last_sum) in last_stats.items()}
+                imported_until = {statistic_id: start for statistic_id, (start, _) in last_stats.items()}
 
-            currency = 'NZD'
+                if all(start is not None for start in imported_until.values()):
+                    resume_date = dt_util.as_local(
+                        dt_util.utc_from_timestamp(min(imported_until.values()))
+                    ).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+                    start_date = max(start_date, resume_date)
+                    _LOGGER.debug("Resuming usage import from %s", start_date.strftime("%Y-%m-%d"))
 
-            for i in range(self._usage_days):
-                current_date = today - timedelta(days=self._usage_days - i)
-                _LOGGER.debug("Fetching data for %s", current_date.strftime("%Y-%m-%d"))
-                
-                response = await self._api.get_usage(
-                    str(current_date.year), 
-                    str(current_date.month), 
-                    str(current_date.day)
-                )
+            if start_date > end_date:
+                _LOGGER.debug("Statistics are already up to date")
+                self._latest_day = end_date.date()
+                self._last_update = now
+                self._update_failures = 0
+                return True
+
+            usage_days = (end_date - start_date).days + 1
+            usage = await self._async_fetch_usage(start_date.date(), end_date.date())
 
-                if not response or not response[0]:
-                    _LOGGER.debug("No data available from %s onwards, stopping fetch", current_date.strftime("%Y-%m-%d"))
+            days = []
+            for i in range(usage_days):
+                current_date = start_date + timedelta(days=i)
+                day = current_date.strftime("%Y-%m-%d")
+                day_usage = usage.get(day)
+
+                if not day_usage:
+                    _LOGGER.debug("No data available from %s onwards, stopping fetch", day)
                     break
+                days.append((day, day_usage))
+                self._latest_day = current_date.date()
 
-                for point in response:
-                        if point['currency'] and currency != point['currency']:
-                            currency = point['currency']
-                        if point["value"]:
-                            # If the off peak value is not '0.00' then the energy is free.
-                            # HASSIO statistics requires us to add values as a sum of all previous values.
-                            if point["offpeakValue"] == "0.00":
-                                kWhRunningSum = kWhRunningSum + float(point["value"])
-                                dollarRunningSum = dollarRunningSum + float(point["dollarValue"])
-                            else:
-                                freeKWhRunningSum = freeKWhRunningSum + float(
-                                    point["value"]
-                                )
-
-                            freeKWhStatistics.append(
-                                StatisticData(
-                                    start=datetime.strptime(
-                                        point["date"], "%Y-%m-%dT%H:%M:%S.%f%z"
-                                    ),
-                                    sum=freeKWhRunningSum,
-                                )
-                            )
-                            kWhStatistics.append(
-                                StatisticData(
-                                    start=datetime.strptime(
-                                        point["date"], "%Y-%m-%dT%H:%M:%S.%f%z"
-                                    ),
-                                    sum=kWhRunningSum,
-                                )
-                            )
-                            dollarStatistics.append(
-                                StatisticData(
-                                    start=datetime.strptime(
-                                        point["date"], "%Y-%m-%dT%H:%M:%S.%f%z"
-                                    ),
-                                    sum=dollarRunningSum,
-                                )
-                            )
-
-            icp = self._icp
-            kWhMetadata = StatisticMetaData(
-                has_mean=False,
-                has_sum=True,
-                name=f"Contact Energy - Electricity ({icp})",
-                source=DOMAIN,
-                statistic_id=f"{DOMAIN}:energy_consumption",
-                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-            )
-            async_add_external_statistics(self.hass, kWhMetadata, kWhStatistics)
-
-            dollarMetadata = StatisticMetaData(
-                has_mean=False,
-                has_sum=True,
-                name=f"Contact Energy - Electricity Cost ({icp})",
-                source=DOMAIN,
-                statistic_id=f"{DOMAIN}:energy_consumption_in_dollars",
-                unit_of_measurement=currency,
-            )
-            async_add_external_statistics(self.hass, dollarMetadata, dollarStatistics)
-
-            freeKWHMetadata = StatisticMetaData(
-                has_mean=False,
-                has_sum=True,
-                name=f"Contact Energy - Free Electricity ({icp})",
-                source=DOMAIN,
-                statistic_id=f"{DOMAIN}:free_energy_consumption",
-                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-            )
-            async_add_external_statistics(self.hass, freeKWHMetadata, freeKWhStatistics)
+            if not days:
+                _LOGGER.debug("No new usage data available, nothing to import")
+                self._last_update = now
+                self._update_failures = 0
+                return True
+
+            # Days whose content is unchanged since they were last imported are
+            # not imported again; rows are only rebuilt from the first changed day.
+            digests = {day: day_usage.digest() for day, day_usage in days}
+            changed = 0
+            if self._cache is not None:
+                changed = next(
+                    (index for index, (day, _) in enumerate(days) if self._cache.get_digest(day) != digests[day]),
+                    None
+                )
+                if changed is None:
+                    _LOGGER.debug("Usage unchanged since the last import, nothing to import")
+                    if sums is None:
+                        last_stats = await self._async_get_last_statistics()
+                        sums = {statistic_id: last_sum for statistic_id, (_, last_sum) in last_stats.items()}
+                    self._state = sums[self._ids[0]]
+                    self._last_update = now
+                    self._update_failures = 0
+                    return True
+
+                # A revised day, or a new day without incremental import, continues
+                # from the stored sums just before it. New days in incremental mode
+                # already continue from the last stored rows.
+                revised = self._cache.get_digest(days[changed][0]) is not None
+                if revised or (changed > 0 and not self._incremental):
+                    day_start = days[changed][1].hours[0] * 3600
+                    stored_sums = await self._async_get_sums_before(day_start)
+                    if stored_sums is not None:
+                        sums = stored_sums
+                        imported_until = None
+                    else:
+                        changed = 0
+                _LOGGER.debug("Importing usage from %s", days[changed][0])
 
-            self._state = kWhRunningSum
+            hourly = HourlyUsage.concat(day_usage for _, day_usage in days[changed:])
+            result = build_statistics(hourly, self._ids, sums, imported_until)
+
+            metadata = build_metadata(self._icp, result.currency, self._ids)
+            for statistic_id, statistics in result.statistics.items():
+                if statistics:
+                    async_add_external_statistics(self.hass, metadata[statistic_id], statistics)
+            if self._cache is not None:
+                self._cache.async_set_digests(digests)
+
+            self._state = result.sums[self._ids[0]]
             self._last_update = now
             self._update_failures = 0
             return True
@@ -176,10 +265,96 @@ class ContactEnergyUsageSensor(BaseSensor):
             if self._update_failures >= 3:
                 _LOGGER.warning("Multiple update failures, attempting to re-login")
                 await self._api.async_login()
-            
+
             # If this was a forced update that failed, schedule another update soon
-            if force_update:
-                _LOGGER.info("Scheduling another update attempt in 1 hour")
+            if force_update and self._scheduler is None:
+                _LOGGER.info("Scheduling another update attempt")
                 self.async_schedule_update_ha_state(True)
-            
-            return False
\ No newline at end of file
+
+            return False
+
+    async def _async_fetch_usage(self, start: date, end: date) -> dict[str, HourlyUsage]:
+        """Return usage for [start, end], serving finalized days from the cache.
+
+        Fetch errors are raised, so an outage counts as a failed update. An
+        empty response only means the provider has nothing new yet.
+        """
+        usage = {}
+        fetch_from = start
+        if self._cache is not None:
+            await self._cache.async_load()
+            fetch_from = self._cache.first_missing(start, end)
+            day = start
+            while day <= end and day != fetch_from:
+                usage[day.isoformat()] = self._cache.get_final(day)
+                day += timedelta(days=1)
+
+        if self._cache is not None:
+            self._api.metrics.record_cache(
+                "usage", hits=len(usage), misses=(end - start).days + 1 - len(usage)
+            )
+
+        if fetch_from is None:
+            _LOGGER.debug("All usage days served from cache")
+            return usage
+
+        _LOGGER.debug("Fetching usage from %s (%d days from cache)", fetch_from.isoformat(), len(usage))
+        try:
+            fetched = await self._api.get_usage_range(
+                fetch_from, end, self._account_id, self._contract_id, raise_errors=True
+            )
+        except RequestRejected as error:
+            # Only a rejected ranged request falls back to per-day requests;
+            # other errors fail the update, so an outage is not multiplied
+            _LOGGER.debug("Ranged usage request rejected (%s), falling back to per-day requests", error)
+            fetched = await self._api.get_usage_days(
+                [fetch_from + timedelta(days=i) for i in range((end - fetch_from).days + 1)],
+                self._account_id,
+                self._contract_id
+            )
+            # Per-day requests swallow their errors, so nothing back is a failure
+            if not fetched:
+                raise UnknownError(f"No usage data received from {fetch_from.isoformat()}")
+
+        if not fetched:
+            _LOGGER.debug("No usage data available from %s yet", fetch_from.isoformat())
+            return usage
+
+        fetched = {day: HourlyUsage.from_points(points) for day, points in fetched.items()}
+        if self._cache is not None:
+            self._cache.async_put(fetched)
+        usage.update(fetched)
+        return usage
+
+    async def _async_get_sums_before(self, timestamp: float) -> dict[str, float] | None:
+        """Return the stored sum of each statistic for the hour before timestamp."""
+        stats = await get_instance(self.hass).async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            dt_util.utc_from_timestamp(timestamp - 3600),
+            dt_util.utc_from_timestamp(timestamp),
+            set(self._ids),
+            "hour",
+            None,
+            {"sum"},
+        )
+        if not all(stats.get(statistic_id) for statistic_id in self._ids):
+            return None
+        return {statistic_id: stats[statistic_id][0]["sum"] or 0 for statistic_id in self._ids}
+
+    async def _async_get_last_statistics(self) -> dict[str, tuple]:
+        """Return (start timestamp, sum) of the last stored row for each statistic."""
+        last_stats = {}
+        for statistic_id in self._ids:
+            result = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+            )
+            if result and result.get(statistic_id):
+                row = result[statistic_id][0]
+                start = row["start"]
+                if isinstance(start, datetime):
+                    start = start.timestamp()
+                last_stats[statistic_id] = (start, row["sum"] or 0)
+            else:
+                last_stats[statistic_id] = (None, 0)
+        return last_stats
@@ -0,0 +1,98 @@
+"""Services for the Contact Energy integration."""
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_END_DATE,
+    ATTR_ICP,
+    ATTR_INTERVAL,
+    ATTR_START_DATE,
+    CONF_ACCOUNT_ID,
+    CONF_CONTRACT_ICP,
+    CONF_CONTRACT_ID,
+    CONF_CONTRACTS,
+    CONF_LEGACY_STATISTICS,
+    DATA_IMPORTS,
+    DOMAIN,
+    SERVICE_IMPORT_USAGE_RANGE,
+    USAGE_INTERVAL_HOURLY,
+    USAGE_INTERVALS,
+)
+from .importer import ContactEnergyUsageImport
+from .statistics import statistic_ids
+
+_LOGGER = logging.getLogger(__name__)
+
+IMPORT_USAGE_RANGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_ICP): cv.string,
+        vol.Optional(ATTR_INTERVAL, default=USAGE_INTERVAL_HOURLY): vol.In(USAGE_INTERVALS),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services, once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_IMPORT_USAGE_RANGE):
+        return
+
+    async def async_import_usage_range(call: ServiceCall) -> None:
+        """Start a background import of the range for the selected contracts."""
+        start = call.data[ATTR_START_DATE]
+        end = call.data[ATTR_END_DATE]
+        interval = call.data[ATTR_INTERVAL]
+        icp = call.data.get(ATTR_ICP)
+        if end < start:
+            raise HomeAssistantError("The end date must not be before the start date")
+
+        targets = [
+            (entry, contract)
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id in hass.data[DOMAIN]
+            for contract in entry.data[CONF_CONTRACTS]
+            if icp is None or contract[CONF_CONTRACT_ICP].lower() == icp.lower()
+        ]
+        if not targets:
+            raise HomeAssistantError(f"No loaded Contact Energy contract matches ICP {icp}")
+
+        imports = hass.data[DOMAIN].setdefault(DATA_IMPORTS, {})
+        for _, contract in targets:
+            contract_icp = contract[CONF_CONTRACT_ICP]
+            if (running := imports.get(contract_icp)) is not None and not running.done():
+                raise HomeAssistantError(f"A usage import is already running for ICP {contract_icp}")
+
+        for entry, contract in targets:
+            contract_icp = contract[CONF_CONTRACT_ICP]
+            usage_import = ContactEnergyUsageImport(
+                hass,
+                hass.data[DOMAIN][entry.entry_id],
+                contract_icp,
+                entry.data[CONF_ACCOUNT_ID],
+                contract[CONF_CONTRACT_ID],
+                start,
+                end,
+                statistic_ids(contract_icp, contract.get(CONF_LEGACY_STATISTICS, False), interval),
+                interval,
+            )
+            _LOGGER.info("Importing %s usage for %s from %s to %s", interval, contract_icp, start, end)
+            imports[contract_icp] = entry.async_create_background_task(
+                hass, usage_import.async_run(), f"{DOMAIN}_import_{contract_icp}"
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_IMPORT_USAGE_RANGE, async_import_usage_range, schema=IMPORT_USAGE_RANGE_SCHEMA
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration's services once the last entry is unloaded."""
+    hass.services.async_remove(DOMAIN, SERVICE_IMPORT_USAGE_RANGE)
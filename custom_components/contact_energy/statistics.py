@@ -0,0 +1,120 @@
+"""Helpers for Contact Energy long-term statistics."""
+from dataclasses import dataclass, field
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.const import UnitOfEnergy
+
+from .const import (
+    DOMAIN,
+    STATISTIC_ENERGY,
+    STATISTIC_ENERGY_DOLLARS,
+    STATISTIC_FREE_ENERGY,
+    USAGE_INTERVAL_HOURLY,
+)
+from .usage import HourlyUsage
+
+# Statistic ids are (energy, cost, free energy) tuples, in the order of the
+# HourlyUsage columns they are built from.
+StatisticIds = tuple[str, str, str]
+
+_OBJECT_IDS = (STATISTIC_ENERGY, STATISTIC_ENERGY_DOLLARS, STATISTIC_FREE_ENERGY)
+
+
+def statistic_ids(icp: str, legacy: bool = False, interval: str = USAGE_INTERVAL_HOURLY) -> StatisticIds:
+    """Return the usage statistic ids of an ICP at an interval.
+
+    Entries created before multiple contracts were supported imported to the
+    same unsuffixed ids whatever the ICP; a migrated contract keeps those so
+    its history stays continuous. Coarser intervals are kept in their own
+    series, e.g. contact_energy:energy_consumption_daily_<icp>, since a
+    statistic only holds rows of one resolution.
+    """
+    if interval != USAGE_INTERVAL_HOURLY:
+        return tuple(f"{DOMAIN}:{object_id}_{interval}_{icp.lower()}" for object_id in _OBJECT_IDS)
+    if legacy:
+        return tuple(f"{DOMAIN}:{object_id}" for object_id in _OBJECT_IDS)
+    return tuple(f"{DOMAIN}:{object_id}_{icp.lower()}" for object_id in _OBJECT_IDS)
+
+
+def build_metadata(
+    icp: str, currency: str, ids: StatisticIds, interval: str = USAGE_INTERVAL_HOURLY
+) -> dict[str, StatisticMetaData]:
+    """Return the statistic metadata for each usage series, keyed by statistic_id."""
+    energy_id, dollars_id, free_id = ids
+    suffix = "" if interval == USAGE_INTERVAL_HOURLY else f" {interval.capitalize()}"
+    return {
+        energy_id: StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Contact Energy - Electricity{suffix} ({icp})",
+            source=DOMAIN,
+            statistic_id=energy_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        ),
+        dollars_id: StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Contact Energy - Electricity Cost{suffix} ({icp})",
+            source=DOMAIN,
+            statistic_id=dollars_id,
+            unit_of_measurement=currency,
+        ),
+        free_id: StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Contact Energy - Free Electricity{suffix} ({icp})",
+            source=DOMAIN,
+            statistic_id=free_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        ),
+    }
+
+
+@dataclass
+class UsageStatistics:
+    """Statistics rows and running sums produced by build_statistics."""
+
+    sums: dict[str, float]
+    currency: str = "NZD"
+    statistics: dict[str, list[StatisticData]] = field(default_factory=dict)
+
+
+def build_statistics(
+    usage: HourlyUsage,
+    ids: StatisticIds,
+    sums: dict[str, float] | None = None,
+    imported_until: dict[str, float | None] | None = None,
+) -> UsageStatistics:
+    """Build all usage statistic series in a single pass over the hourly columns.
+
+    This is the recorder boundary: StatisticData objects are only created here.
+    HASSIO statistics requires us to add values as a sum of all previous values,
+    so each series continues from the given starting sum and skips hours at or
+    before its imported_until timestamp.
+    """
+    result = UsageStatistics(
+        sums=dict(sums or dict.fromkeys(ids, 0.0)),
+        currency=usage.currency or "NZD",
+        statistics={statistic_id: [] for statistic_id in ids},
+    )
+    imported_until = imported_until or {}
+
+    series = [
+        (result.statistics[statistic_id], values, imported_until.get(statistic_id))
+        for statistic_id, values in zip(ids, (usage.kwh, usage.dollars, usage.free_kwh))
+    ]
+    running = [result.sums[statistic_id] for statistic_id in ids]
+    for index, hour in enumerate(usage.hours):
+        timestamp = hour * 3600
+        start = None
+        for position, (rows, values, until) in enumerate(series):
+            if until is not None and timestamp <= until:
+                continue
+            if start is None:
+                start = usage.start(index)
+            running[position] += values[index]
+            rows.append(StatisticData(start=start, sum=running[position]))
+
+    result.sums.update(zip(ids, running))
+
+    return result
@@ -0,0 +1,118 @@
+"""Persistent cache of daily Contact Energy usage payloads."""
+import logging
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    USAGE_CACHE_MAX_DAYS,
+    USAGE_CACHE_SAVE_DELAY,
+    USAGE_CACHE_STORAGE_VERSION,
+    USAGE_SETTLEMENT_DAYS,
+)
+from .usage import HourlyUsage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _UsageCacheStore(Store):
+    """Store that discards cache data written in an older format."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """Drop the old cache; the days are simply fetched again."""
+        return {"days": {}}
+
+
+class ContactEnergyUsageCache:
+    """Per-ICP cache of hourly usage, keyed by ISO date.
+
+    Days older than the provider's settlement lag are marked final and never
+    requested again; recent, provisional days are always refetched. Days older
+    than USAGE_CACHE_MAX_DAYS are evicted.
+
+    The cache also keeps the digest of each day as it was last imported into
+    the recorder, so unchanged days are not imported again.
+    """
+
+    def __init__(self, hass: HomeAssistant, icp: str) -> None:
+        """Initialize the cache."""
+        self._store = _UsageCacheStore(hass, USAGE_CACHE_STORAGE_VERSION, f"{DOMAIN}.usage_{icp}")
+        self._days: dict[str, tuple[bool, HourlyUsage]] = {}
+        self._digests: dict[str, str] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the cache from disk, once."""
+        if self._loaded:
+            return
+        data = await self._store.async_load() or {}
+        self._days = {
+            day: (entry["final"], HourlyUsage.from_dict(entry["usage"]))
+            for day, entry in data.get("days", {}).items()
+        }
+        self._digests = data.get("digests", {})
+        self._loaded = True
+        _LOGGER.debug("Loaded %d cached usage days", len(self._days))
+
+    def get_final(self, day: date) -> HourlyUsage | None:
+        """Return the cached usage for a day if that day is final."""
+        entry = self._days.get(day.isoformat())
+        if entry and entry[0]:
+            return entry[1]
+        return None
+
+    def first_missing(self, start: date, end: date) -> date | None:
+        """Return the first day in [start, end] that is not final in the cache."""
+        day = start
+        while day <= end:
+            if self.get_final(day) is None:
+                return day
+            day += timedelta(days=1)
+        return None
+
+    def get_digest(self, day: str) -> str | None:
+        """Return the digest of a day as last imported, if any."""
+        return self._digests.get(day)
+
+    def async_set_digests(self, digests: dict[str, str]) -> None:
+        """Record the digests of imported days and schedule a save."""
+        self._digests.update(digests)
+        self._evict()
+        self._store.async_delay_save(self._data_to_save, USAGE_CACHE_SAVE_DELAY)
+
+    def async_put(self, usage: dict[str, HourlyUsage]) -> None:
+        """Store fetched days and schedule a save."""
+        settled_before = (date.today() - timedelta(days=USAGE_SETTLEMENT_DAYS)).isoformat()
+        for day, day_usage in usage.items():
+            if not day_usage:
+                continue
+            self._days[day] = (day < settled_before, day_usage)
+        self._evict()
+        self._store.async_delay_save(self._data_to_save, USAGE_CACHE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the cache from disk."""
+        self._days = {}
+        self._digests = {}
+        await self._store.async_remove()
+
+    def _evict(self) -> None:
+        """Drop days that have aged out of the cache."""
+        oldest = (date.today() - timedelta(days=USAGE_CACHE_MAX_DAYS)).isoformat()
+        for day in [day for day in self._days if day < oldest]:
+            del self._days[day]
+        for day in [day for day in self._digests if day < oldest]:
+            del self._digests[day]
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "days": {
+                day: {"final": final, "usage": day_usage.as_dict()}
+                for day, (final, day_usage) in self._days.items()
+            },
+            "digests": self._digests,
+        }